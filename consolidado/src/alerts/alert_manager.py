@@ -4,13 +4,24 @@ Maneja múltiples canales y tipos de alertas
 """
 
 import asyncio
+import bisect
+import itertools
 import logging
-from typing import Dict, List, Optional, Any, Set
+import sys
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+from collections import deque
 from enum import Enum
 import json
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
 from .channels.base_channel import BaseChannel, AlertPriority
 from .channels.email_channel import EmailChannel
 from .channels.telegram_channel import TelegramChannel
@@ -23,7 +34,7 @@ from .triggers.risk_trigger import RiskTrigger
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class Alert:
     """Estructura de una alerta"""
     id: str
@@ -32,10 +43,38 @@ class Alert:
     priority: AlertPriority
     symbol: str
     timestamp: datetime
-    channels: List[str]
+    channels: Tuple[str, ...]
     metadata: Dict[str, Any] = None
     sent: bool = False
     retry_count: int = 0
+    dedup_hash: int = 0
+
+    def to_bytes(self) -> bytes:
+        """JSON UTF-8 listo para el POST del canal, sin pasar por asdict"""
+        return serialize_alert(self)
+
+def serialize_alert(alert: Alert) -> bytes:
+    """
+    Serializa una alerta a JSON (bytes) listo para POST por canales
+
+    Usa orjson si está disponible (3-10x más rápido que json stdlib,
+    maneja datetime nativamente); si no, cae al codec estándar.
+    """
+    payload = {
+        'id': alert.id,
+        'title': alert.title,
+        'message': alert.message,
+        'priority': alert.priority.value,
+        'symbol': alert.symbol,
+        'timestamp': alert.timestamp,
+        'channels': list(alert.channels),
+        'metadata': alert.metadata,
+    }
+
+    if _HAS_ORJSON:
+        return orjson.dumps(payload)
+
+    return json.dumps(payload, default=str).encode('utf-8')
 
 class AlertManager:
     """
@@ -48,26 +87,57 @@ class AlertManager:
         self.channels: Dict[str, BaseChannel] = {}
         self.triggers: Dict[str, BaseTrigger] = {}
         
-        # Queue de alertas pendientes
-        self.alert_queue = asyncio.Queue()
+        # Queue de alertas pendientes, acotada para aplicar backpressure
+        self.alert_queue = asyncio.Queue(
+            maxsize=config.get('queue_maxsize', 10_000)
+        )
+        # Cola auxiliar para alertas críticas (no espera backpressure)
+        self.priority_queue = asyncio.Queue(
+            maxsize=config.get('priority_queue_maxsize', 1024)
+        )
         
-        # Historial de alertas
-        self.alert_history: List[Alert] = []
+        # Historial de alertas: ring buffer acotado, append O(1)
+        max_history = config.get('max_history_size', 1000)
+        self.alert_history: deque = deque(maxlen=max_history)
         
-        # Rate limiting
+        # Rate limiting: deques de timestamps monotónicos por canal/prioridad,
+        # ordenadas por inserción para expirar desde la cabeza
         self.rate_limits = config.get('rate_limits', {})
-        self.sent_alerts_tracker = {}
+        self.sent_alerts_tracker: Dict[str, deque] = {}
         
         # Control de duplicados
         self.duplicate_window = timedelta(
             minutes=config.get('duplicate_window_minutes', 5)
         )
-        self.recent_alerts: Set[str] = set()
+        # Ventana deslizante de duplicados: deque ordenada por expiración
+        # + mapa hash -> expiración para lookup O(1)
+        self._dup_deque: deque = deque()
+        self._dup_map: Dict[int, datetime] = {}
         
         # Workers para procesar alertas
         self.workers_running = False
         self.worker_tasks = []
-        
+        self._stop_event = asyncio.Event()
+        self.alert_batch_size = config.get('alert_batch_size', 32)
+        self.concurrency_per_worker = config.get('alert_concurrency_per_worker', 16)
+
+        # Contador atómico para IDs de alertas, libre de colisiones
+        self._alert_seq = itertools.count()
+
+        # Alertas descartadas por cola llena (visible en get_alert_stats)
+        self._dropped_alerts = 0
+
+        # Buckets de conteo por minuto/hora para servir get_alert_stats
+        # en O(1) acotado, sin escanear el historial completo
+        self._per_minute_buckets: deque = deque(maxlen=60)
+        self._per_hour_buckets: deque = deque(maxlen=24)
+        self._total_sent = 0
+
+        # Planes de envío cacheados: la membresía de canales solo cambia
+        # en _init_channels, así que resolverla una vez por combinación
+        self._resolve_cache: Dict[Any, Tuple[str, ...]] = {}
+        self._send_plan_cache: Dict[Tuple[str, ...], Tuple[Tuple[str, BaseChannel], ...]] = {}
+
         # Inicializar componentes
         self._init_channels()
         self._init_triggers()
@@ -88,7 +158,11 @@ class AlertManager:
                     
             except Exception as e:
                 logger.error(f"Error inicializando canal {channel_name}: {e}")
-    
+
+        # Invalidar planes de envío resueltos con la membresía anterior
+        self._resolve_cache.clear()
+        self._send_plan_cache.clear()
+
     def _create_channel(self, name: str, config: Dict[str, Any]) -> Optional[BaseChannel]:
         """Factory para crear canales"""
         channel_type = config.get('type', '').lower()
@@ -145,13 +219,17 @@ class AlertManager:
             return
         
         self.workers_running = True
-        
+        self._stop_event.clear()
+
         # Inicializar canales
         for channel in self.channels.values():
             await channel.initialize()
         
-        # Crear workers para procesar alertas
-        num_workers = self.config.get('alert_workers', 3)
+        # Crear workers para procesar alertas; por defecto escala con la
+        # cantidad de canales (trabajo I/O-bound), no un número fijo
+        num_workers = self.config.get(
+            'alert_workers', max(4, len(self.channels) * 2)
+        )
         for i in range(num_workers):
             task = asyncio.create_task(self._alert_worker(f"worker-{i}"))
             self.worker_tasks.append(task)
@@ -164,7 +242,8 @@ class AlertManager:
             return
         
         self.workers_running = False
-        
+        self._stop_event.set()
+
         # Cancelar workers
         for task in self.worker_tasks:
             task.cancel()
@@ -180,162 +259,262 @@ class AlertManager:
         logger.info("AlertManager detenido")
     
     async def _alert_worker(self, worker_name: str):
-        """Worker que procesa alertas de la queue"""
+        """Worker que procesa alertas de la queue en lotes"""
         logger.info(f"Alert worker {worker_name} iniciado")
-        
+
+        # Acota los _process_alert en vuelo por worker para no
+        # disparar la cantidad de tasks bajo ráfagas
+        semaphore = asyncio.Semaphore(self.concurrency_per_worker)
+
+        async def process_bounded(alert: Alert):
+            async with semaphore:
+                await self._process_alert(alert)
+
         while self.workers_running:
             try:
-                # Obtener alerta de la queue con timeout
-                alert = await asyncio.wait_for(
-                    self.alert_queue.get(), 
-                    timeout=1.0
+                # Bloquear hasta la primera alerta (de cualquiera de las
+                # dos colas) o la señal de parada, sin el poll de 1s
+                get_priority = asyncio.create_task(self.priority_queue.get())
+                get_main = asyncio.create_task(self.alert_queue.get())
+                stop_task = asyncio.create_task(self._stop_event.wait())
+
+                done, pending = await asyncio.wait(
+                    {get_priority, get_main, stop_task},
+                    return_when=asyncio.FIRST_COMPLETED
                 )
-                
-                await self._process_alert(alert)
-                self.alert_queue.task_done()
-                
-            except asyncio.TimeoutError:
-                # Timeout normal, continuar
-                continue
+                for task in pending:
+                    task.cancel()
+
+                batch = []
+                n_priority = n_main = 0
+
+                if get_priority in done:
+                    batch.append(get_priority.result())
+                    n_priority += 1
+                if get_main in done:
+                    batch.append(get_main.result())
+                    n_main += 1
+
+                if not batch:
+                    break
+
+                # Drenar hasta batch_size alertas adicionales sin ceder
+                # el loop, priorizando la cola crítica
+                while len(batch) < self.alert_batch_size:
+                    try:
+                        batch.append(self.priority_queue.get_nowait())
+                        n_priority += 1
+                    except asyncio.QueueEmpty:
+                        break
+                while len(batch) < self.alert_batch_size:
+                    try:
+                        batch.append(self.alert_queue.get_nowait())
+                        n_main += 1
+                    except asyncio.QueueEmpty:
+                        break
+
+                # Procesar el lote en paralelo
+                await asyncio.gather(
+                    *(process_bounded(alert) for alert in batch),
+                    return_exceptions=True
+                )
+
+                for _ in range(n_priority):
+                    self.priority_queue.task_done()
+                for _ in range(n_main):
+                    self.alert_queue.task_done()
+
+            except asyncio.CancelledError:
+                break
             except Exception as e:
                 logger.error(f"Error en worker {worker_name}: {e}")
-        
+
         logger.info(f"Alert worker {worker_name} detenido")
     
+    def _enqueue_alert(self, alert: Alert) -> bool:
+        """
+        Encola una alerta sin suspender al productor
+
+        Las críticas pasan por la cola prioritaria; las demás usan
+        put_nowait y se descartan (con contador) si la cola está llena,
+        en vez de bloquear el hot path de la estrategia que alerta.
+
+        Returns:
+            True si la alerta quedó encolada
+        """
+        if alert.priority == AlertPriority.CRITICAL:
+            try:
+                self.priority_queue.put_nowait(alert)
+            except asyncio.QueueFull:
+                # Descartar la más vieja antes que bloquear una crítica
+                try:
+                    dropped = self.priority_queue.get_nowait()
+                    self.priority_queue.task_done()
+                    self._dropped_alerts += 1
+                    logger.warning(
+                        f"Cola prioritaria llena, descartada alerta {dropped.id}"
+                    )
+                except asyncio.QueueEmpty:
+                    pass
+                self.priority_queue.put_nowait(alert)
+            return True
+
+        try:
+            self.alert_queue.put_nowait(alert)
+            return True
+        except asyncio.QueueFull:
+            self._dropped_alerts += 1
+            logger.warning(f"Cola de alertas llena, descartada alerta {alert.id}")
+            return False
+
     async def _process_alert(self, alert: Alert):
         """Procesa una alerta individual"""
         try:
+            # Un solo timestamp compartido por todo el procesamiento
+            now_dt = datetime.now()
+            now_mono = time.monotonic()
+
             # Verificar rate limiting
-            if not self._check_rate_limit(alert):
+            if not self._check_rate_limit(alert, now_mono):
                 logger.debug(f"Alerta {alert.id} bloqueada por rate limiting")
                 return
-            
+
             # Verificar duplicados
-            if self._is_duplicate(alert):
+            if self._is_duplicate(alert, now_dt):
                 logger.debug(f"Alerta {alert.id} ignorada (duplicado)")
                 return
             
-            # Enviar por todos los canales especificados
-            send_tasks = []
-            for channel_name in alert.channels:
-                if channel_name in self.channels:
-                    channel = self.channels[channel_name]
-                    task = channel.send_alert(alert)
-                    send_tasks.append((channel_name, task))
-            
-            # Ejecutar envíos en paralelo
-            for channel_name, task in send_tasks:
-                try:
-                    await task
-                    logger.info(f"Alerta {alert.id} enviada por {channel_name}")
-                except Exception as e:
-                    logger.error(f"Error enviando alerta por {channel_name}: {e}")
-                    
+            # Enviar por todos los canales especificados, con el plan
+            # (nombre, canal) resuelto una sola vez por combinación
+            send_plan = self._send_plan_cache.get(alert.channels)
+            if send_plan is None:
+                send_plan = tuple(
+                    (name, self.channels[name])
+                    for name in alert.channels if name in self.channels
+                )
+                self._send_plan_cache[alert.channels] = send_plan
+
+            send_channels = [name for name, _ in send_plan]
+            send_tasks = [
+                asyncio.create_task(channel.send_alert(alert))
+                for _, channel in send_plan
+            ]
+
+            # Ejecutar envíos en paralelo: la latencia total es la del
+            # canal más lento, no la suma de todos
+            results = await asyncio.gather(*send_tasks, return_exceptions=True)
+
+            for channel_name, result in zip(send_channels, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error enviando alerta por {channel_name}: {result}")
+
                     # Retry para alertas críticas
                     if alert.priority == AlertPriority.CRITICAL and alert.retry_count < 3:
                         alert.retry_count += 1
                         await asyncio.sleep(2 ** alert.retry_count)  # Backoff exponencial
-                        await self.alert_queue.put(alert)
+                        self._enqueue_alert(alert)
+                else:
+                    logger.info(f"Alerta {alert.id} enviada por {channel_name}")
             
             # Marcar como enviada
             alert.sent = True
-            self._track_sent_alert(alert)
+            self._track_sent_alert(alert, now_mono)
             
-            # Agregar a historial
+            # Agregar a historial (la deque descarta lo más viejo sola)
             self.alert_history.append(alert)
-            
-            # Limpiar historial viejo
-            self._cleanup_history()
-            
+            self._record_sent(now_dt)
+
         except Exception as e:
             logger.error(f"Error procesando alerta {alert.id}: {e}")
     
-    def _check_rate_limit(self, alert: Alert) -> bool:
+    def _record_sent(self, now: datetime):
+        """Incrementa los buckets de conteo por minuto y por hora"""
+        self._total_sent += 1
+
+        minute = int(now.timestamp()) // 60
+        if self._per_minute_buckets and self._per_minute_buckets[-1][0] == minute:
+            self._per_minute_buckets[-1][1] += 1
+        else:
+            self._per_minute_buckets.append([minute, 1])
+
+        hour = minute // 60
+        if self._per_hour_buckets and self._per_hour_buckets[-1][0] == hour:
+            self._per_hour_buckets[-1][1] += 1
+        else:
+            self._per_hour_buckets.append([hour, 1])
+
+    def _check_rate_limit(self, alert: Alert, now: float) -> bool:
         """Verifica rate limiting por canal y prioridad"""
-        now = datetime.now()
-        
         for channel_name in alert.channels:
             # Obtener límites para este canal
             channel_limits = self.rate_limits.get(channel_name, {})
             priority_limit = channel_limits.get(alert.priority.value, {})
-            
+
             max_per_hour = priority_limit.get('max_per_hour')
             max_per_minute = priority_limit.get('max_per_minute')
-            
+
             if not max_per_hour and not max_per_minute:
                 continue
-            
+
             # Inicializar tracker si no existe
             key = f"{channel_name}_{alert.priority.value}"
             if key not in self.sent_alerts_tracker:
-                self.sent_alerts_tracker[key] = []
-            
+                self.sent_alerts_tracker[key] = deque()
+
             tracker = self.sent_alerts_tracker[key]
-            
-            # Limpiar alertas viejas
-            hour_ago = now - timedelta(hours=1)
-            minute_ago = now - timedelta(minutes=1)
-            
-            tracker[:] = [ts for ts in tracker if ts > hour_ago]
-            
+
+            # Expirar desde la cabeza: amortizado O(1) por entrada,
+            # independiente del límite configurado
+            hour_ago = now - 3600.0
+            minute_ago = now - 60.0
+
+            while tracker and tracker[0] <= hour_ago:
+                tracker.popleft()
+
             # Verificar límites
             if max_per_hour:
                 alerts_last_hour = len(tracker)
                 if alerts_last_hour >= max_per_hour:
                     return False
-            
+
             if max_per_minute:
-                alerts_last_minute = len([ts for ts in tracker if ts > minute_ago])
+                alerts_last_minute = len(tracker) - bisect.bisect_right(tracker, minute_ago)
                 if alerts_last_minute >= max_per_minute:
                     return False
-        
+
         return True
-    
-    def _track_sent_alert(self, alert: Alert):
+
+    def _track_sent_alert(self, alert: Alert, now: float):
         """Registra alerta enviada para rate limiting"""
-        now = datetime.now()
-        
         for channel_name in alert.channels:
             key = f"{channel_name}_{alert.priority.value}"
             if key not in self.sent_alerts_tracker:
-                self.sent_alerts_tracker[key] = []
-            
+                self.sent_alerts_tracker[key] = deque()
+
             self.sent_alerts_tracker[key].append(now)
-    
-    def _is_duplicate(self, alert: Alert) -> bool:
+
+    def _is_duplicate(self, alert: Alert, now: datetime) -> bool:
         """Verifica si la alerta es duplicada reciente"""
-        # Crear hash único de la alerta
-        alert_hash = f"{alert.symbol}_{alert.title}_{alert.message}"
-        
-        # Limpiar alertas viejas del set
-        current_time = datetime.now()
-        cutoff_time = current_time - self.duplicate_window
-        
-        # Filtrar alertas recientes
-        recent_to_keep = set()
-        for recent_hash in self.recent_alerts:
-            # Aquí necesitaríamos más información para filtrar por tiempo
-            # Por simplicidad, mantenemos todas por ahora
-            recent_to_keep.add(recent_hash)
-        
-        self.recent_alerts = recent_to_keep
-        
-        # Verificar si es duplicado
-        if alert_hash in self.recent_alerts:
+        # Hash precalculado en create_alert: aquí solo ops de dict/int
+        alert_hash = alert.dedup_hash
+
+        # Expirar entradas viejas desde la cabeza de la deque (amortizado O(1))
+        while self._dup_deque and self._dup_deque[0][0] <= now:
+            expiry, expired_hash = self._dup_deque.popleft()
+            # Solo borrar del mapa si no fue re-registrado con expiración nueva
+            if self._dup_map.get(expired_hash) == expiry:
+                del self._dup_map[expired_hash]
+
+        # Verificar si es duplicado dentro de la ventana
+        if alert_hash in self._dup_map:
             return True
-        
-        # Agregar a recientes
-        self.recent_alerts.add(alert_hash)
+
+        # Registrar con su tiempo de expiración
+        expiry = now + self.duplicate_window
+        self._dup_deque.append((expiry, alert_hash))
+        self._dup_map[alert_hash] = expiry
         return False
     
-    def _cleanup_history(self):
-        """Limpia historial viejo de alertas"""
-        max_history = self.config.get('max_history_size', 1000)
-        
-        if len(self.alert_history) > max_history:
-            # Mantener solo las más recientes
-            self.alert_history = self.alert_history[-max_history:]
-    
     async def create_alert(
         self,
         title: str,
@@ -351,35 +530,49 @@ class AlertManager:
         Returns:
             ID de la alerta creada
         """
-        if channels is None:
-            # Usar canales por defecto según prioridad
-            default_channels = self.config.get('default_channels', {})
-            channels = default_channels.get(priority.value, list(self.channels.keys()))
-        
-        # Filtrar canales disponibles
-        available_channels = [ch for ch in channels if ch in self.channels]
+        # Resolver canales disponibles con cache por (prioridad, canales)
+        cache_key = (priority, tuple(channels) if channels is not None else None)
+        available_channels = self._resolve_cache.get(cache_key)
+
+        if available_channels is None:
+            if channels is None:
+                # Usar canales por defecto según prioridad
+                default_channels = self.config.get('default_channels', {})
+                channels = default_channels.get(priority.value, list(self.channels.keys()))
+
+            # Tupla de strings internadas para compartir memoria entre
+            # alertas con la misma combinación
+            available_channels = tuple(
+                sys.intern(ch) for ch in channels if ch in self.channels
+            )
+            self._resolve_cache[cache_key] = available_channels
         
         if not available_channels:
             logger.warning(f"No hay canales disponibles para alerta: {title}")
             return None
         
-        # Crear alerta
-        alert_id = f"alert_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(title) % 10000}"
-        
+        # Crear alerta; el ID combina epoch + secuencia, sin strftime
+        # ni hash del título (colisionaba vía hash % 10000)
+        now = datetime.now()
+        alert_id = f"alert_{int(now.timestamp())}_{next(self._alert_seq):x}"
+
         alert = Alert(
             id=alert_id,
             title=title,
             message=message,
             priority=priority,
-            symbol=symbol,
-            timestamp=datetime.now(),
+            symbol=sys.intern(symbol),
+            timestamp=now,
             channels=available_channels,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            # Clave de dedup calculada una sola vez por alerta
+            dedup_hash=hash((symbol, title, message)) & 0xFFFFFFFFFFFFFFFF
         )
         
-        # Encolar para procesamiento
-        await self.alert_queue.put(alert)
-        
+        # Encolar para procesamiento sin suspender al productor
+        if not self._enqueue_alert(alert):
+            return None
+
         logger.info(f"Alerta creada: {alert_id} - {title}")
         return alert_id
     
@@ -390,31 +583,54 @@ class AlertManager:
         Args:
             market_data: Datos de mercado actuales
         """
-        for trigger_name, trigger in self.triggers.items():
-            try:
-                should_trigger, alert_data = await trigger.check(market_data)
-                
-                if should_trigger:
-                    await self.create_alert(**alert_data)
-                    
-            except Exception as e:
-                logger.error(f"Error verificando trigger {trigger_name}: {e}")
+        if not self.triggers:
+            return
+
+        # Fan-out: todos los triggers en paralelo, con timeout por
+        # trigger para que uno colgado no bloquee al resto
+        timeout = self.config.get('trigger_timeout_s', 2.0)
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(trigger.check(market_data), timeout)
+                for trigger in self.triggers.values()
+            ),
+            return_exceptions=True
+        )
+
+        for trigger_name, result in zip(self.triggers, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.error(f"Timeout verificando trigger {trigger_name}")
+                continue
+            if isinstance(result, Exception):
+                logger.error(f"Error verificando trigger {trigger_name}: {result}")
+                continue
+
+            should_trigger, alert_data = result
+            if should_trigger:
+                await self.create_alert(**alert_data)
     
     def get_alert_stats(self) -> Dict[str, Any]:
         """Obtiene estadísticas del sistema de alertas"""
-        now = datetime.now()
-        last_hour = now - timedelta(hours=1)
-        last_24h = now - timedelta(hours=24)
-        
-        # Filtrar alertas por tiempo
-        alerts_last_hour = [a for a in self.alert_history if a.timestamp > last_hour]
-        alerts_last_24h = [a for a in self.alert_history if a.timestamp > last_24h]
-        
+        # Servir los conteos desde los buckets: trabajo acotado (60+24
+        # sumas) independiente del tamaño del historial
+        now_minute = int(time.time()) // 60
+        now_hour = now_minute // 60
+
+        alerts_last_hour = sum(
+            count for minute, count in self._per_minute_buckets
+            if minute > now_minute - 60
+        )
+        alerts_last_24h = sum(
+            count for hour, count in self._per_hour_buckets
+            if hour > now_hour - 24
+        )
+
         return {
-            'total_alerts_sent': len(self.alert_history),
-            'alerts_last_hour': len(alerts_last_hour),
-            'alerts_last_24h': len(alerts_last_24h),
-            'pending_alerts': self.alert_queue.qsize(),
+            'total_alerts_sent': self._total_sent,
+            'alerts_last_hour': alerts_last_hour,
+            'alerts_last_24h': alerts_last_24h,
+            'pending_alerts': self.alert_queue.qsize() + self.priority_queue.qsize(),
+            'dropped_alerts': self._dropped_alerts,
             'active_channels': len(self.channels),
             'active_triggers': len(self.triggers),
             'workers_running': self.workers_running,
@@ -2,11 +2,39 @@
 Base Connector - Clase base para todos los conectores de datos
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
+@dataclass(slots=True)
+class Tick:
+    """Último precio de un símbolo, sin el costo de un DataFrame"""
+    timestamp_ms: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+# Timeframes soportados y su duración en milisegundos, precomputados a
+# nivel de módulo: membresía O(1) sin alocar una lista por llamada
+TF_MS = {
+    '1m': 60_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '1h': 3_600_000,
+    '4h': 14_400_000,
+    '1d': 86_400_000,
+    '1w': 604_800_000,
+    '1M': 2_592_000_000,
+}
+
+_VALID_TIMEFRAMES = frozenset(TF_MS)
+
 class BaseConnector(ABC):
     """Clase base para conectores de fuentes de datos"""
     
@@ -47,11 +75,51 @@ class BaseConnector(ABC):
     async def get_realtime_data(self, symbol: str) -> pd.DataFrame:
         """
         Obtiene datos en tiempo real
-        
+
         Returns:
             DataFrame con último tick/candle
         """
         pass
+
+    async def get_realtime_data_batch(
+        self, symbols: List[str]
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Datos en tiempo real para varios símbolos en una llamada
+
+        Fallback genérico: una llamada por símbolo en paralelo. Los
+        conectores cuyo exchange soporta endpoints batch deben
+        sobreescribirlo para amortizar el round-trip.
+        """
+        results = await asyncio.gather(
+            *(self.get_realtime_data(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+
+        batch: Dict[str, pd.DataFrame] = {}
+        for symbol, df in zip(symbols, results):
+            if isinstance(df, Exception) or df is None or df.empty:
+                continue
+            batch[symbol] = df
+        return batch
+
+    async def get_latest_tick(self, symbol: str) -> Optional[Tick]:
+        """
+        Fast-path para el último tick sin construir un DataFrame
+        (implementación opcional; por defecto deriva del DataFrame)
+        """
+        df = await self.get_realtime_data(symbol)
+        if df.empty:
+            return None
+        row = df.iloc[-1]
+        return Tick(
+            timestamp_ms=int(row['timestamp'].timestamp() * 1000),
+            open=float(row['open']),
+            high=float(row['high']),
+            low=float(row['low']),
+            close=float(row['close']),
+            volume=float(row['volume']),
+        )
     
     @abstractmethod
     async def get_symbols(self) -> List[str]:
@@ -77,8 +145,7 @@ class BaseConnector(ABC):
     
     def _validate_timeframe(self, timeframe: str) -> bool:
         """Valida timeframe"""
-        valid_timeframes = ['1m', '5m', '15m', '1h', '4h', '1d', '1w', '1M']
-        return timeframe in valid_timeframes
+        return timeframe in _VALID_TIMEFRAMES
     
     def _normalize_symbol(self, symbol: str) -> str:
         """Normaliza símbolo al formato del exchange"""
@@ -91,21 +158,23 @@ class BaseConnector(ABC):
         Args:
             data: Lista de [timestamp, open, high, low, close, volume]
         """
-        if not data:
+        if len(data) == 0:
             return pd.DataFrame()
-            
-        df = pd.DataFrame(data, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume'
-        ])
-        
-        # Convertir timestamp a datetime
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        
-        # Convertir valores numéricos
-        numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-        df[numeric_cols] = df[numeric_cols].astype(float)
-        
-        # Ordenar por timestamp
-        df = df.sort_values('timestamp').reset_index(drop=True)
-        
+
+        # Un solo parseo a nivel C en vez de boxing por elemento
+        arr = np.asarray(data, dtype=np.float64)
+
+        df = pd.DataFrame({
+            'timestamp': pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms'),
+            'open': arr[:, 1],
+            'high': arr[:, 2],
+            'low': arr[:, 3],
+            'close': arr[:, 4],
+            'volume': arr[:, 5],
+        }, copy=False)
+
+        # Ordenar solo si el exchange no entregó los candles en orden
+        if not np.all(np.diff(arr[:, 0]) >= 0):
+            df = df.sort_values('timestamp').reset_index(drop=True)
+
         return df
\ No newline at end of file
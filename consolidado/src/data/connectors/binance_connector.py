@@ -4,12 +4,14 @@ Binance Connector - Conector para Binance Exchange
 
 import asyncio
 import logging
+import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import ccxt.async_support as ccxt
 
-from .base_connector import BaseConnector
+from .base_connector import BaseConnector, TF_MS, Tick
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,22 @@ class BinanceConnector(BaseConnector):
         self.api_secret = config.get('api_secret')
         self.sandbox = config.get('sandbox', True)
         self.testnet = config.get('testnet', True)
-        
+
+        # Serializa el primer connect ante llamadas concurrentes y
+        # cachea load_markets (una llamada HTTP de varios MB) con TTL
+        self._connect_lock = asyncio.Lock()
+        self._markets_cache: Optional[Dict[str, Any]] = None
+        self._markets_ts = 0.0
+        self._markets_ttl = config.get('markets_cache_ttl', 300)
+
+    async def _ensure_client(self):
+        """Garantiza un único connect aunque haya callers concurrentes"""
+        if self._client:
+            return
+        async with self._connect_lock:
+            if not self._client:
+                await self.connect()
+
     async def connect(self) -> bool:
         """Establece conexión con Binance"""
         try:
@@ -37,8 +54,9 @@ class BinanceConnector(BaseConnector):
             if self.testnet:
                 self._client.set_sandbox_mode(True)
             
-            # Test de conexión
-            await self._client.load_markets()
+            # Test de conexión (y primer llenado del cache de mercados)
+            self._markets_cache = await self._client.load_markets()
+            self._markets_ts = time.monotonic()
             logger.info("Conectado a Binance exitosamente")
             return True
             
@@ -71,8 +89,7 @@ class BinanceConnector(BaseConnector):
         Returns:
             DataFrame con datos OHLCV
         """
-        if not self._client:
-            await self.connect()
+        await self._ensure_client()
         
         if not self._validate_symbol(symbol) or not self._validate_timeframe(timeframe):
             raise ValueError("Símbolo o timeframe inválido")
@@ -81,84 +98,149 @@ class BinanceConnector(BaseConnector):
             # Convertir fechas a timestamp
             since = int(start_date.timestamp() * 1000)
             until = int(end_date.timestamp() * 1000)
-            
-            all_data = []
-            current_since = since
-            
-            # Binance tiene límite de 1000 candles por request
-            while current_since < until:
-                ohlcv = await self._client.fetch_ohlcv(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    since=current_since,
-                    limit=1000
-                )
-                
-                if not ohlcv:
-                    break
-                
-                all_data.extend(ohlcv)
-                
-                # Actualizar timestamp para siguiente batch
-                current_since = ohlcv[-1][0] + 1
-                
-                # Evitar rate limiting
-                await asyncio.sleep(0.1)
-            
-            # Filtrar datos hasta end_date
-            filtered_data = [
-                candle for candle in all_data 
-                if candle[0] <= until
-            ]
-            
-            return self._create_ohlcv_dataframe(filtered_data)
+
+            # Particionar el rango en ventanas de 1000 candles (límite de
+            # Binance por request) y bajarlas en paralelo; el semáforo
+            # acota la concurrencia al presupuesto de rate limit
+            window_ms = 1000 * TF_MS[timeframe]
+            windows = range(since, until, window_ms)
+            semaphore = asyncio.Semaphore(max(1, self.rate_limit // 6))
+
+            async def fetch_window(window_since: int) -> np.ndarray:
+                async with semaphore:
+                    batch = await self._client.fetch_ohlcv(
+                        symbol=symbol,
+                        timeframe=timeframe,
+                        since=window_since,
+                        limit=1000
+                    )
+                # Empaquetar el batch a float64 de inmediato: libera los
+                # objetos Python por candle en vez de acumularlos todos
+                if not batch:
+                    return np.empty((0, 6), dtype=np.float64)
+                arr = np.asarray(batch, dtype=np.float64)
+
+                # Recortar al rango propio de la ventana: el exchange
+                # devuelve las primeras 1000 candles DESDE since, así
+                # que una ventana con huecos (símbolo listado después,
+                # downtime) trae candles de ventanas posteriores y el
+                # concatenado duplicaría filas
+                return arr[arr[:, 0] < window_since + window_ms]
+
+            chunks = await asyncio.gather(
+                *(fetch_window(w) for w in windows)
+            )
+
+            # Las ventanas, ya recortadas, son disjuntas: concatenar
+            # preserva el orden
+            if chunks:
+                arr = np.concatenate(chunks)
+            else:
+                arr = np.empty((0, 6), dtype=np.float64)
+
+            # Filtrar datos hasta end_date con una máscara vectorizada
+            arr = arr[arr[:, 0] <= until]
+
+            return self._create_ohlcv_dataframe(arr)
             
         except Exception as e:
             logger.error(f"Error obteniendo datos históricos de Binance: {e}")
             return pd.DataFrame()
     
+    async def get_latest_tick(self, symbol: str) -> Optional[Tick]:
+        """
+        Obtiene el último ticker de Binance sin pasar por pandas
+        (fast-path para loops por tick)
+        """
+        await self._ensure_client()
+
+        try:
+            ticker = await self._client.fetch_ticker(symbol)
+
+            return Tick(
+                timestamp_ms=int(datetime.now().timestamp() * 1000),
+                open=ticker['open'],
+                high=ticker['high'],
+                low=ticker['low'],
+                close=ticker['last'],
+                volume=ticker['baseVolume'],
+            )
+
+        except Exception as e:
+            logger.error(f"Error obteniendo datos en tiempo real de Binance: {e}")
+            return None
+
     async def get_realtime_data(self, symbol: str) -> pd.DataFrame:
         """
         Obtiene último ticker de Binance
-        
+
         Args:
             symbol: Par de trading
-            
+
         Returns:
             DataFrame con último precio
         """
-        if not self._client:
-            await self.connect()
-        
+        tick = await self.get_latest_tick(symbol)
+
+        if tick is None:
+            return pd.DataFrame()
+
+        return self._create_ohlcv_dataframe([[
+            tick.timestamp_ms,
+            tick.open,
+            tick.high,
+            tick.low,
+            tick.close,
+            tick.volume,
+        ]])
+    
+    async def get_realtime_data_batch(
+        self, symbols: List[str]
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Últimos tickers de varios símbolos en una sola request
+        (fetch_tickers amortiza el round-trip HTTP sobre N símbolos)
+        """
+        await self._ensure_client()
+
         try:
-            ticker = await self._client.fetch_ticker(symbol)
-            
-            # Crear DataFrame con datos actuales
-            current_time = datetime.now()
-            data = [[
-                int(current_time.timestamp() * 1000),
+            tickers = await self._client.fetch_tickers(symbols)
+        except Exception as e:
+            logger.error(f"Error obteniendo tickers batch de Binance: {e}")
+            return {}
+
+        now_ms = int(datetime.now().timestamp() * 1000)
+        batch: Dict[str, pd.DataFrame] = {}
+
+        for symbol in symbols:
+            ticker = tickers.get(symbol)
+            if not ticker or ticker.get('last') is None:
+                continue
+
+            batch[symbol] = self._create_ohlcv_dataframe([[
+                now_ms,
                 ticker['open'],
-                ticker['high'], 
+                ticker['high'],
                 ticker['low'],
                 ticker['last'],
-                ticker['baseVolume']
-            ]]
-            
-            return self._create_ohlcv_dataframe(data)
-            
-        except Exception as e:
-            logger.error(f"Error obteniendo datos en tiempo real de Binance: {e}")
-            return pd.DataFrame()
-    
+                ticker['baseVolume'],
+            ]])
+
+        return batch
+
     async def get_symbols(self) -> List[str]:
         """Obtiene lista de símbolos disponibles en Binance"""
-        if not self._client:
-            await self.connect()
-        
+        await self._ensure_client()
+
         try:
-            markets = await self._client.load_markets()
-            return list(markets.keys())
-            
+            # Reusar el cache mientras no venza el TTL
+            if (self._markets_cache is None or
+                    time.monotonic() - self._markets_ts >= self._markets_ttl):
+                self._markets_cache = await self._client.load_markets()
+                self._markets_ts = time.monotonic()
+
+            return list(self._markets_cache.keys())
+
         except Exception as e:
             logger.error(f"Error obteniendo símbolos de Binance: {e}")
             return []
@@ -195,8 +277,7 @@ class BinanceConnector(BaseConnector):
         Returns:
             Diccionario con info de cuenta y balances
         """
-        if not self._client:
-            await self.connect()
+        await self._ensure_client()
         
         if not self.api_key or not self.api_secret:
             raise ValueError("API keys requeridas para info de cuenta")
@@ -239,8 +320,7 @@ class BinanceConnector(BaseConnector):
         Returns:
             Información de la orden creada
         """
-        if not self._client:
-            await self.connect()
+        await self._ensure_client()
         
         if not self.api_key or not self.api_secret:
             raise ValueError("API keys requeridas para trading")
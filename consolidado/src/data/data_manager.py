@@ -5,12 +5,19 @@ Integra todas las fuentes de datos y procesamiento
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import pickle
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 
-from .connectors.base_connector import BaseConnector
+try:
+    import redis.asyncio as aioredis
+    _HAS_REDIS = True
+except ImportError:
+    _HAS_REDIS = False
+
+from .connectors.base_connector import BaseConnector, TF_MS
 from .connectors.binance_connector import BinanceConnector
 from .connectors.alpaca_connector import AlpacaConnector
 from .connectors.yahoo_connector import YahooConnector
@@ -20,6 +27,36 @@ from .storage.data_storage import DataStorage
 
 logger = logging.getLogger(__name__)
 
+class RingFrame:
+    """
+    Buffer circular struct-of-arrays para datos por símbolo
+    Un ndarray por columna con capacidad fija: append O(1) y lectura
+    del último valor sin alocar DataFrames ni Series
+    """
+
+    __slots__ = ('capacity', 'columns', 'data', '_head', 'size')
+
+    def __init__(self, columns, capacity: int = 256):
+        self.capacity = capacity
+        self.columns = tuple(columns)
+        self.data = {col: np.full(capacity, np.nan) for col in self.columns}
+        self._head = -1
+        self.size = 0
+
+    def append(self, row: Dict[str, float]):
+        """Escribe una fila; sobreescribe la más vieja al llenarse"""
+        self._head = (self._head + 1) % self.capacity
+        for col in self.columns:
+            self.data[col][self._head] = row.get(col, np.nan)
+        self.size = min(self.size + 1, self.capacity)
+
+    def last(self) -> Dict[str, float]:
+        """Última fila como dict de floats (una carga indexada por columna)"""
+        if self.size == 0:
+            return {}
+        head = self._head
+        return {col: self.data[col][head] for col in self.columns}
+
 class DataManager:
     """
     Gestor central de todos los datos del sistema
@@ -35,9 +72,51 @@ class DataManager:
         
         # Inicializar conectores según configuración
         self._init_connectors()
+
+        # Cache Redis opcional para cortocircuitar fetches repetidos
+        # del mismo rango histórico (el loop de estrategias pide el
+        # mismo rango cada pocos minutos)
+        cache_config = config.get('cache', {})
+        self.cache = None
+        self.cache_ttl = cache_config.get('ttl_seconds', 300)
+
+        if _HAS_REDIS and cache_config.get('enabled', False):
+            try:
+                self.cache = aioredis.Redis(
+                    host=cache_config.get('host', 'localhost'),
+                    port=cache_config.get('port', 6379),
+                    db=cache_config.get('db', 0),
+                )
+                logger.info("Cache Redis habilitado para datos históricos")
+            except Exception as e:
+                logger.error(f"Error inicializando cache Redis: {e}")
         
-        # Cache para datos en tiempo real
-        self.realtime_cache = {}
+        # Cache para datos en tiempo real: ring buffer SoA por símbolo
+        # (memoria acotada, sin DataFrames por tick)
+        self.realtime_cache: Dict[str, RingFrame] = {}
+        self._realtime_ring_capacity = config.get('realtime_ring_capacity', 256)
+
+        # Estado streaming de indicadores por (símbolo, timeframe):
+        # cada barra nueva actualiza en O(1) en vez de recomputar la
+        # ventana completa. Los ticks realtime NO son barras: se
+        # agregan en la barra abierta (_open_bars) y el estado solo
+        # avanza al cruzar un límite del timeframe
+        self.streaming_features: Dict[Tuple[str, str], Any] = {}
+        self._recent_features: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._recent_features_max_bars = config.get('recent_features_max_bars', 500)
+        self._open_bars: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+        # Persistencia fuera del camino crítico: los writes de storage
+        # van a una cola acotada y un worker los drena en background
+        self._storage_queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
+        self._storage_task: Optional[asyncio.Task] = None
+
+        # Compilar los kernels Numba ahora (cacheados a disco): el costo
+        # de JIT se paga en el arranque y no en el primer fetch
+        try:
+            self.feature_engine.warmup()
+        except Exception as e:
+            logger.warning(f"Warmup de FeatureEngine falló: {e}")
         
     def _init_connectors(self):
         """Inicializa conectores según configuración"""
@@ -83,7 +162,18 @@ class DataManager:
         """
         if sources is None:
             sources = list(self.connectors.keys())
-            
+
+        # Cache hit: clave por bucket del timeframe, así requests del
+        # mismo rango redondeado comparten entrada
+        cache_key = self._historical_cache_key(symbol, timeframe, start_date, end_date)
+        if self.cache is not None:
+            try:
+                raw = await self.cache.get(cache_key)
+                if raw is not None:
+                    return pickle.loads(raw)
+            except Exception as e:
+                logger.warning(f"Error leyendo cache histórico: {e}")
+
         all_data = []
         
         for source in sources:
@@ -96,31 +186,154 @@ class DataManager:
                 data = await connector.get_historical_data(
                     symbol, timeframe, start_date, end_date
                 )
-                
+
                 if not data.empty:
-                    data['source'] = source
-                    all_data.append(data)
+                    all_data.append((source, data))
                     logger.info(f"Datos históricos obtenidos de {source}: {len(data)} registros")
-                    
+
             except Exception as e:
                 logger.error(f"Error obteniendo datos de {source}: {e}")
-        
+
         if not all_data:
             return pd.DataFrame()
-            
-        # Combinar datos de múltiples fuentes
-        combined_data = self._combine_multi_source_data(all_data)
+
+        if len(all_data) == 1:
+            # Caso común (una sola fuente responde): sin concat ni
+            # dedupe; el source como categorical cuesta 1 byte/fila
+            source, combined_data = all_data[0]
+            combined_data['source'] = pd.Categorical(
+                [source] * len(combined_data),
+                categories=list(self.connectors)
+            )
+        else:
+            # Combinar datos de múltiples fuentes
+            frames = []
+            for source, frame in all_data:
+                frame['source'] = source
+                frames.append(frame)
+            combined_data = self._combine_multi_source_data(frames)
         
         # Procesar datos
         processed_data = self.processor.process_ohlcv_data(combined_data)
         
         # Generar features
         enhanced_data = self.feature_engine.generate_features(processed_data)
-        
-        # Guardar en storage
-        await self.storage.save_historical_data(symbol, timeframe, enhanced_data)
-        
+
+        # Sembrar el estado streaming y cachear el frame enriquecido
+        # para que el loop de estrategias no vuelva a recomputar todo
+        if not enhanced_data.empty and 'close' in enhanced_data.columns:
+            key = (symbol, timeframe)
+            state = self.feature_engine.create_streaming_state()
+            state.seed(enhanced_data['close'].to_numpy(dtype=np.float64))
+            self.streaming_features[key] = state
+            self._recent_features[key] = enhanced_data.tail(
+                self._recent_features_max_bars
+            )
+
+            # Límite de la última barra sembrada: los ticks que caigan
+            # dentro de ella no vuelven a avanzar el estado
+            tf_ms = TF_MS.get(timeframe, 60_000)
+            last_ts = enhanced_data['timestamp'].iloc[-1]
+            self._open_bars[key] = {
+                'bucket': int(last_ts.timestamp() * 1000) // tf_ms,
+                'row': None,
+                'features': None,
+            }
+
+        # Poblar cache para los próximos ciclos
+        if self.cache is not None:
+            try:
+                await self.cache.set(
+                    cache_key, pickle.dumps(enhanced_data), ex=self.cache_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Error escribiendo cache histórico: {e}")
+
+        # Guardar en storage en background: el caller no espera el write
+        self._enqueue_storage_write(symbol, timeframe, enhanced_data)
+
         return enhanced_data
+
+    def _enqueue_storage_write(
+        self, symbol: str, timeframe: str, data: pd.DataFrame
+    ):
+        """Encola un write de storage sin bloquear al caller"""
+        if self._storage_task is None or self._storage_task.done():
+            self._storage_task = asyncio.get_running_loop().create_task(
+                self._storage_worker()
+            )
+
+        try:
+            self._storage_queue.put_nowait((symbol, timeframe, data))
+        except asyncio.QueueFull:
+            logger.warning(f"Cola de storage llena: write de {symbol} descartado")
+
+    async def _storage_worker(self):
+        """Drena la cola de writes de storage en background"""
+        while True:
+            symbol, timeframe, data = await self._storage_queue.get()
+            try:
+                await self.storage.save_historical_data(symbol, timeframe, data)
+            except Exception as e:
+                logger.error(f"Error guardando históricos de {symbol}: {e}")
+            finally:
+                self._storage_queue.task_done()
+
+    async def get_historical_data_batch(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+        sources: Optional[List[str]] = None,
+        concurrency: int = 8
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Backfill histórico para muchos símbolos en paralelo
+
+        Para cold starts y backtests sobre universos grandes: featuriza
+        N símbolos concurrentemente (acotado por semáforo) en vez de
+        uno por vez. Los kernels Numba liberan el GIL, así que el
+        cómputo de features también se solapa entre símbolos.
+
+        Returns:
+            Diccionario símbolo -> DataFrame enriquecido (los símbolos
+            que fallan o no tienen datos se omiten)
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one(symbol: str) -> pd.DataFrame:
+            async with semaphore:
+                return await self.get_historical_data(
+                    symbol, timeframe, start_date, end_date, sources
+                )
+
+        results = await asyncio.gather(
+            *(fetch_one(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+
+        batch: Dict[str, pd.DataFrame] = {}
+        for symbol, data in zip(symbols, results):
+            if isinstance(data, Exception):
+                logger.error(f"Error en backfill de {symbol}: {data}")
+                continue
+            if not data.empty:
+                batch[symbol] = data
+        return batch
+
+    def _historical_cache_key(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> str:
+        """Clave de cache redondeada al límite del timeframe"""
+        bucket_s = max(1, TF_MS.get(timeframe, 60_000) // 1000)
+        start_bucket = int(start_date.timestamp()) // bucket_s
+        end_bucket = int(end_date.timestamp()) // bucket_s
+        return f"hist:{symbol}:{timeframe}:{start_bucket}:{end_bucket}"
     
     async def get_realtime_data(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
         """
@@ -133,32 +346,205 @@ class DataManager:
             Diccionario con datos en tiempo real por símbolo
         """
         realtime_data = {}
-        
-        for symbol in symbols:
-            symbol_data = []
-            
-            for source_name, connector in self.connectors.items():
-                try:
-                    data = await connector.get_realtime_data(symbol)
-                    if data is not None and not data.empty:
-                        data['source'] = source_name
-                        symbol_data.append(data)
-                        
-                except Exception as e:
-                    logger.error(f"Error datos tiempo real {source_name}/{symbol}: {e}")
-            
+
+        # Una llamada batch por fuente (no por símbolo x fuente): los
+        # exchanges con endpoint de tickers múltiples lo resuelven en
+        # una sola request HTTP
+        source_names = list(self.connectors.keys())
+        batch_results = await asyncio.gather(
+            *(
+                connector.get_realtime_data_batch(symbols)
+                for connector in self.connectors.values()
+            ),
+            return_exceptions=True
+        )
+
+        per_symbol: Dict[str, List[pd.DataFrame]] = {}
+        for source_name, batch in zip(source_names, batch_results):
+            if isinstance(batch, Exception):
+                logger.error(f"Error datos tiempo real {source_name}: {batch}")
+                continue
+
+            for symbol, data in batch.items():
+                data['source'] = source_name
+                per_symbol.setdefault(symbol, []).append(data)
+
+        for symbol, symbol_data in per_symbol.items():
             if symbol_data:
                 # Combinar y procesar datos
                 combined = self._combine_multi_source_data(symbol_data)
                 processed = self.processor.process_realtime_data(combined)
-                enhanced = self.feature_engine.generate_realtime_features(processed)
-                
+
+                # Con estado streaming sembrado, los ticks se agregan
+                # a la barra abierta y el update O(1) corre solo al
+                # cerrar una barra; el recomputo bulk de kernels queda
+                # para el cold start (sin estado o sin barra cerrada)
+                features = self._update_streaming_features(symbol, processed)
+                if features is not None:
+                    enhanced = processed.assign(**features)
+                else:
+                    enhanced = self.feature_engine.generate_realtime_features(processed)
+
                 realtime_data[symbol] = enhanced
-                
-                # Actualizar cache
-                self.realtime_cache[symbol] = enhanced
-                
+
+                # Actualizar cache (solo columnas numéricas en el ring)
+                self._append_to_ring(symbol, enhanced)
+
         return realtime_data
+
+    def _append_to_ring(self, symbol: str, frame: pd.DataFrame):
+        """Anexa la última fila de un frame al ring buffer del símbolo"""
+        if frame.empty:
+            return
+
+        row = frame.iloc[-1]
+        values: Dict[str, float] = {}
+        for col in frame.columns:
+            value = row[col]
+            if col == 'timestamp':
+                values[col] = value.timestamp() * 1000.0
+            elif isinstance(value, (int, float, np.floating, np.integer)):
+                values[col] = float(value)
+
+        ring = self.realtime_cache.get(symbol)
+        if ring is None:
+            ring = RingFrame(values.keys(), self._realtime_ring_capacity)
+            self.realtime_cache[symbol] = ring
+
+        ring.append(values)
+
+    def get_latest_values(self, symbol: str) -> Optional[Dict[str, float]]:
+        """
+        Último snapshot numérico del símbolo desde el ring buffer,
+        sin el costo de .iloc[-1] sobre un DataFrame
+        """
+        ring = self.realtime_cache.get(symbol)
+        if ring is None or ring.size == 0:
+            return None
+        return ring.last()
+
+    def _update_streaming_features(
+        self, symbol: str, tick: pd.DataFrame, timeframe: str = '1h'
+    ) -> Optional[Dict[str, float]]:
+        """
+        Agrega el snapshot realtime a las barras abiertas del símbolo
+
+        Los snapshots llegan cada pocos segundos y NO son barras:
+        tratarlos como tales encogería las ventanas (SMA/EMA/RSI) del
+        timeframe sembrado a minutos de ticks. El estado streaming
+        solo avanza cuando el tick cruza un límite del timeframe y la
+        barra abierta queda completa. Devuelve los features de la
+        última barra cerrada del timeframe pedido, o None si todavía
+        no cerró ninguna desde el seed (cold start).
+        """
+        if tick.empty or 'close' not in tick.columns:
+            return None
+
+        row = tick.iloc[-1]
+        ts = row.get('timestamp')
+        if ts is None:
+            return None
+        ts_ms = int(ts.timestamp() * 1000)
+
+        for key, state in self.streaming_features.items():
+            if key[0] == symbol:
+                self._advance_open_bar(key, state, row, ts_ms)
+
+        open_bar = self._open_bars.get((symbol, timeframe))
+        return open_bar['features'] if open_bar is not None else None
+
+    def _advance_open_bar(
+        self,
+        key: Tuple[str, str],
+        state: Any,
+        row: pd.Series,
+        ts_ms: int
+    ):
+        """
+        Agrega un tick a la barra abierta de (símbolo, timeframe);
+        al cruzar el límite cierra la barra, avanza el estado y anexa
+        la fila al frame reciente
+        """
+        tf_ms = TF_MS.get(key[1], 60_000)
+        bucket = ts_ms // tf_ms
+        open_bar = self._open_bars.setdefault(
+            key, {'bucket': bucket, 'row': None, 'features': None}
+        )
+
+        if bucket > open_bar['bucket']:
+            if open_bar['row'] is not None:
+                features = state.update(float(open_bar['row']['close']))
+                open_bar['features'] = features
+                self._append_recent_features(key, open_bar['row'], features)
+
+            # Abrir la barra nueva a partir de este tick; los máximos
+            # del ticker son stats 24h, no de la barra, así que OHL
+            # arrancan del precio actual
+            new_row = {col: row[col] for col in row.index}
+            price = float(row['close'])
+            for col in ('open', 'high', 'low'):
+                if col in new_row:
+                    new_row[col] = price
+            new_row['timestamp'] = pd.Timestamp(bucket * tf_ms, unit='ms')
+            open_bar['bucket'] = bucket
+            open_bar['row'] = new_row
+
+        elif open_bar['row'] is not None:
+            # Tick dentro de la barra abierta: agregar sin avanzar
+            bar_row = open_bar['row']
+            price = float(row['close'])
+            bar_row['close'] = price
+            if 'high' in bar_row:
+                bar_row['high'] = max(bar_row['high'], price)
+            if 'low' in bar_row:
+                bar_row['low'] = min(bar_row['low'], price)
+            if 'volume' in bar_row and 'volume' in row.index:
+                bar_row['volume'] = row['volume']
+        # bucket == bucket sembrado sin barra abierta: el tick cae en
+        # la última barra histórica, ya contada por el seed
+
+    def _append_recent_features(
+        self,
+        key: Tuple[str, str],
+        bar_row: Dict[str, Any],
+        features: Dict[str, float]
+    ):
+        """
+        Anexa una barra cerrada con sus features al frame reciente,
+        acotado. Mismo stacking por columna que
+        _combine_multi_source_data: evita el BlockManager nuevo de
+        pd.concat en cada barra
+        """
+        recent = self._recent_features.get(key)
+        if recent is None:
+            return
+
+        new_row = dict(bar_row)
+        new_row.update(features)
+
+        columns: Dict[str, np.ndarray] = {}
+        for col in recent.columns:
+            arr = recent[col].to_numpy()
+            try:
+                tail = np.array([new_row.get(col)], dtype=arr.dtype)
+            except (TypeError, ValueError):
+                arr = arr.astype(object)
+                tail = np.array([new_row.get(col)], dtype=object)
+            columns[col] = np.concatenate([arr, tail])
+
+        appended = pd.DataFrame(columns, copy=False)
+        self._recent_features[key] = appended.tail(
+            self._recent_features_max_bars
+        )
+
+    def get_recent_features(
+        self, symbol: str, timeframe: str = '1h'
+    ) -> Optional[pd.DataFrame]:
+        """
+        Devuelve el frame de features mantenido incrementalmente para
+        (símbolo, timeframe), o None si todavía no hay estado
+        """
+        return self._recent_features.get((symbol, timeframe))
     
     def _combine_multi_source_data(self, data_list: List[pd.DataFrame]) -> pd.DataFrame:
         """
@@ -172,21 +558,34 @@ class DataManager:
         """
         if not data_list:
             return pd.DataFrame()
-            
+
         if len(data_list) == 1:
             return data_list[0]
-        
-        # Estrategia de combinación basada en prioridad y calidad
-        combined = pd.concat(data_list, ignore_index=True)
-        
-        # Eliminar duplicados manteniendo el mejor dato
-        combined = combined.sort_values(['timestamp', 'source'])
-        combined = combined.drop_duplicates(subset=['timestamp'], keep='first')
-        
-        # Ordenar por timestamp
-        combined = combined.sort_values('timestamp').reset_index(drop=True)
-        
-        return combined
+
+        # Ordenar fuentes por prioridad (nombre, como el sort original
+        # por ['timestamp', 'source']) antes de concatenar columnas
+        frames = sorted(
+            data_list,
+            key=lambda df: str(df['source'].iloc[0]) if 'source' in df else ''
+        )
+
+        columns = frames[0].columns
+        arrays = {
+            col: np.concatenate([df[col].to_numpy() for df in frames])
+            for col in columns
+        }
+
+        # Un solo argsort estable sobre int64: para timestamps iguales
+        # preserva el orden de prioridad de las fuentes
+        ts = arrays['timestamp'].astype('datetime64[ns]').astype(np.int64)
+        order = np.argsort(ts, kind='stable')
+
+        # Primera ocurrencia por timestamp == mejor fuente disponible
+        _, first_idx = np.unique(ts[order], return_index=True)
+        keep = order[first_idx]
+
+        # Reconstruir el DataFrame con una sola asignación por columna
+        return pd.DataFrame({col: arr[keep] for col, arr in arrays.items()})
     
     async def get_market_data_summary(self) -> Dict[str, Any]:
         """
@@ -211,26 +610,50 @@ class DataManager:
         
         return summary
     
+    async def _safe_start_feed(
+        self, source_name: str, connector: BaseConnector, symbols: List[str]
+    ):
+        """Arranca un feed con manejo de errores por fuente"""
+        try:
+            await connector.start_realtime_feed(symbols)
+            logger.info(f"Feed tiempo real iniciado en {source_name}")
+        except Exception as e:
+            logger.error(f"Error iniciando feed {source_name}: {e}")
+
+    async def _safe_stop_feed(self, source_name: str, connector: BaseConnector):
+        """Detiene un feed con manejo de errores por fuente"""
+        try:
+            await connector.stop_realtime_feed()
+            logger.info(f"Feed tiempo real detenido en {source_name}")
+        except Exception as e:
+            logger.error(f"Error deteniendo feed {source_name}: {e}")
+
     async def start_realtime_feeds(self, symbols: List[str]):
-        """Inicia feeds de datos en tiempo real"""
-        for source_name, connector in self.connectors.items():
-            try:
-                await connector.start_realtime_feed(symbols)
-                logger.info(f"Feed tiempo real iniciado en {source_name}")
-            except Exception as e:
-                logger.error(f"Error iniciando feed {source_name}: {e}")
-    
+        """Inicia feeds de datos en tiempo real (handshakes en paralelo)"""
+        await asyncio.gather(
+            *(
+                self._safe_start_feed(name, connector, symbols)
+                for name, connector in self.connectors.items()
+            )
+        )
+
     async def stop_realtime_feeds(self):
-        """Detiene todos los feeds de tiempo real"""
-        for source_name, connector in self.connectors.items():
-            try:
-                await connector.stop_realtime_feed()
-                logger.info(f"Feed tiempo real detenido en {source_name}")
-            except Exception as e:
-                logger.error(f"Error deteniendo feed {source_name}: {e}")
+        """Detiene todos los feeds de tiempo real (en paralelo)"""
+        await asyncio.gather(
+            *(
+                self._safe_stop_feed(name, connector)
+                for name, connector in self.connectors.items()
+            )
+        )
     
     async def cleanup(self):
         """Limpieza de recursos"""
         await self.stop_realtime_feeds()
+
+        # Drenar los writes pendientes antes de cerrar el storage
+        if self._storage_task is not None and not self._storage_task.done():
+            await self._storage_queue.join()
+            self._storage_task.cancel()
+
         await self.storage.close()
         logger.info("DataManager: recursos liberados")
\ No newline at end of file
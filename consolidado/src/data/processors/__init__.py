@@ -0,0 +1,11 @@
+"""
+Processors - Procesamiento y generación de features de mercado
+"""
+
+from .data_processor import DataProcessor
+from .feature_engine import FeatureEngine
+
+__all__ = [
+    'DataProcessor',
+    'FeatureEngine'
+]
@@ -0,0 +1,47 @@
+"""
+Data Processor - Limpieza y normalización de datos OHLCV
+"""
+
+import logging
+from typing import Dict, Any
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class DataProcessor:
+    """Normaliza datos OHLCV provenientes de los conectores"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+
+    def process_ohlcv_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Limpia un DataFrame OHLCV combinado
+
+        Args:
+            data: DataFrame con columnas timestamp, open, high, low,
+                  close, volume (y opcionalmente source)
+
+        Returns:
+            DataFrame sin filas inválidas ni timestamps duplicados
+        """
+        if data.empty:
+            return data
+
+        df = data
+
+        if 'timestamp' in df.columns:
+            df = df.drop_duplicates(subset=['timestamp'], keep='first')
+
+        numeric_cols = [
+            col for col in ('open', 'high', 'low', 'close', 'volume')
+            if col in df.columns
+        ]
+        if numeric_cols:
+            df = df.dropna(subset=numeric_cols)
+
+        return df.reset_index(drop=True)
+
+    def process_realtime_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Procesa datos en tiempo real (mismo pipeline que histórico)"""
+        return self.process_ohlcv_data(data)
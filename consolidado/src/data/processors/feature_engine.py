@@ -0,0 +1,296 @@
+"""
+Feature Engine - Generación de features técnicos
+Indicadores sobre arrays float64 con kernels Numba (sin overhead
+de pandas en los loops de cómputo)
+"""
+
+import logging
+from typing import Dict, Any
+import numpy as np
+import pandas as pd
+from numba import njit
+
+logger = logging.getLogger(__name__)
+
+@njit(cache=True, nogil=True)
+def _sma_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    """SMA por recurrencia de suma rodante: O(n) sin re-sumar la ventana"""
+    n = values.shape[0]
+    out = np.empty(n)
+    out[:] = np.nan
+
+    if n < window:
+        return out
+
+    acc = 0.0
+    for i in range(window):
+        acc += values[i]
+    out[window - 1] = acc / window
+
+    for i in range(window, n):
+        acc += values[i] - values[i - window]
+        out[i] = acc / window
+
+    return out
+
+@njit(cache=True, nogil=True)
+def _ema_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    """EMA por recurrencia escalar"""
+    n = values.shape[0]
+    out = np.empty(n)
+    out[:] = np.nan
+
+    if n == 0:
+        return out
+
+    alpha = 2.0 / (window + 1.0)
+    ema = values[0]
+    out[0] = ema
+
+    for i in range(1, n):
+        ema = alpha * values[i] + (1.0 - alpha) * ema
+        out[i] = ema
+
+    return out
+
+@njit(cache=True, nogil=True)
+def _rsi_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    """RSI con suavizado de Wilder"""
+    n = values.shape[0]
+    out = np.empty(n)
+    out[:] = np.nan
+
+    if n <= window:
+        return out
+
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, window + 1):
+        delta = values[i] - values[i - 1]
+        if delta > 0:
+            gain += delta
+        else:
+            loss -= delta
+
+    avg_gain = gain / window
+    avg_loss = loss / window
+
+    if avg_loss == 0.0:
+        out[window] = 100.0
+    else:
+        out[window] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    for i in range(window + 1, n):
+        delta = values[i] - values[i - 1]
+        g = delta if delta > 0 else 0.0
+        l = -delta if delta < 0 else 0.0
+
+        avg_gain = (avg_gain * (window - 1) + g) / window
+        avg_loss = (avg_loss * (window - 1) + l) / window
+
+        if avg_loss == 0.0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return out
+
+class StreamingSMA:
+    """SMA incremental: update O(1) por barra"""
+
+    __slots__ = ('window', '_buffer', '_idx', '_count', '_acc')
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buffer = np.zeros(window)
+        self._idx = 0
+        self._count = 0
+        self._acc = 0.0
+
+    def update(self, value: float) -> float:
+        if self._count >= self.window:
+            self._acc -= self._buffer[self._idx]
+        else:
+            self._count += 1
+
+        self._buffer[self._idx] = value
+        self._acc += value
+        self._idx = (self._idx + 1) % self.window
+
+        if self._count < self.window:
+            return float('nan')
+        return self._acc / self.window
+
+class StreamingEMA:
+    """EMA incremental: update O(1) por barra"""
+
+    __slots__ = ('alpha', '_ema')
+
+    def __init__(self, window: int):
+        self.alpha = 2.0 / (window + 1.0)
+        self._ema = None
+
+    def update(self, value: float) -> float:
+        if self._ema is None:
+            self._ema = value
+        else:
+            self._ema = self.alpha * value + (1.0 - self.alpha) * self._ema
+        return self._ema
+
+class StreamingRSI:
+    """RSI incremental con suavizado de Wilder: update O(1) por barra"""
+
+    __slots__ = ('window', '_prev', '_avg_gain', '_avg_loss', '_count')
+
+    def __init__(self, window: int):
+        self.window = window
+        self._prev = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._count = 0
+
+    def update(self, value: float) -> float:
+        if self._prev is None:
+            self._prev = value
+            return float('nan')
+
+        delta = value - self._prev
+        self._prev = value
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        self._count += 1
+        if self._count <= self.window:
+            # Acumulación inicial (promedio simple)
+            self._avg_gain += (gain - self._avg_gain) / self._count
+            self._avg_loss += (loss - self._avg_loss) / self._count
+            if self._count < self.window:
+                return float('nan')
+        else:
+            self._avg_gain = (self._avg_gain * (self.window - 1) + gain) / self.window
+            self._avg_loss = (self._avg_loss * (self.window - 1) + loss) / self.window
+
+        if self._avg_loss == 0.0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+
+class StreamingFeatureState:
+    """
+    Estado de indicadores streaming para un símbolo
+    Cada barra nueva actualiza todos los indicadores en O(1),
+    evitando recomputar la ventana completa
+    """
+
+    def __init__(self, sma_windows, ema_windows, rsi_window):
+        self._smas = {w: StreamingSMA(w) for w in sma_windows}
+        self._emas = {w: StreamingEMA(w) for w in ema_windows}
+        self._rsi = StreamingRSI(rsi_window)
+        self._rsi_window = rsi_window
+        self._ema_windows = list(ema_windows)
+        self._macd_signal = StreamingEMA(9)
+        self.last_features: Dict[str, float] = {}
+
+    def seed(self, closes: np.ndarray):
+        """Inicializa el estado con una serie histórica de cierres"""
+        for value in closes:
+            self.update(float(value))
+
+    def update(self, close: float) -> Dict[str, float]:
+        """Actualiza todos los indicadores con la nueva barra"""
+        features: Dict[str, float] = {}
+
+        for window, sma in self._smas.items():
+            features[f'sma_{window}'] = sma.update(close)
+
+        ema_values = {}
+        for window, ema in self._emas.items():
+            ema_values[window] = ema.update(close)
+            features[f'ema_{window}'] = ema_values[window]
+
+        features[f'rsi_{self._rsi_window}'] = self._rsi.update(close)
+
+        if len(self._ema_windows) >= 2:
+            fast, slow = self._ema_windows[0], self._ema_windows[1]
+            macd = ema_values[fast] - ema_values[slow]
+            features['macd'] = macd
+            features['macd_signal'] = self._macd_signal.update(macd)
+
+        self.last_features = features
+        return features
+
+class FeatureEngine:
+    """
+    Motor de features técnicos
+    Calcula indicadores sobre views float64 de las columnas OHLCV
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+
+        features_config = config.get('features', {})
+        self.sma_windows = features_config.get('sma_windows', [20, 50])
+        self.ema_windows = features_config.get('ema_windows', [12, 26])
+        self.rsi_window = features_config.get('rsi_window', 14)
+
+    def warmup(self):
+        """Fuerza la compilación JIT de los kernels con un array chico"""
+        sample = np.linspace(1.0, 2.0, 64)
+        _sma_kernel(sample, 8)
+        _ema_kernel(sample, 8)
+        _rsi_kernel(sample, 8)
+        logger.info("FeatureEngine: kernels Numba compilados")
+
+    def generate_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Genera features técnicos para un DataFrame OHLCV
+
+        Args:
+            data: DataFrame procesado con columna 'close'
+
+        Returns:
+            DataFrame con columnas de indicadores agregadas
+        """
+        if data.empty or 'close' not in data.columns:
+            return data
+
+        # Una sola extracción a float64; los kernels trabajan sobre
+        # el array crudo sin dispatch de pandas
+        close = data['close'].to_numpy(dtype=np.float64)
+
+        features: Dict[str, np.ndarray] = {}
+
+        for window in self.sma_windows:
+            features[f'sma_{window}'] = _sma_kernel(close, window)
+
+        emas: Dict[int, np.ndarray] = {}
+        for window in self.ema_windows:
+            emas[window] = _ema_kernel(close, window)
+            features[f'ema_{window}'] = emas[window]
+
+        features[f'rsi_{self.rsi_window}'] = _rsi_kernel(close, self.rsi_window)
+
+        # MACD como diferencia de las dos primeras EMAs configuradas
+        if len(self.ema_windows) >= 2:
+            fast, slow = self.ema_windows[0], self.ema_windows[1]
+            macd = emas[fast] - emas[slow]
+            features['macd'] = macd
+            features['macd_signal'] = _ema_kernel(macd, 9)
+
+        result = data.copy()
+        for name, values in features.items():
+            # Los indicadores se consumen como float32 aguas abajo
+            # (ensembles ML, cache): la mitad de bytes por columna.
+            # OHLCV se mantiene en float64
+            result[name] = values.astype(np.float32)
+
+        return result
+
+    def generate_realtime_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Features para datos en tiempo real (mismos kernels)"""
+        return self.generate_features(data)
+
+    def create_streaming_state(self) -> StreamingFeatureState:
+        """Crea un estado de indicadores streaming con la config actual"""
+        return StreamingFeatureState(
+            self.sma_windows, self.ema_windows, self.rsi_window
+        )
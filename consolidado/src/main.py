@@ -5,8 +5,13 @@ Integra RL, ML, alertas y gestión de riesgo
 
 import asyncio
 import logging
+import math
+import os
 import signal
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any
 
@@ -14,6 +19,20 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as _ResponseClass
+except ImportError:
+    from fastapi.responses import JSONResponse as _ResponseClass
+
+# Event loop libuv (Cython): acelera sockets y scheduling en todo el
+# sistema; opcional, el loop default sigue funcionando sin él
+try:
+    import uvloop
+    _HAS_UVLOOP = True
+except ImportError:
+    _HAS_UVLOOP = False
+
 from .config import load_config
 from .data import DataManager
 from .strategies import StrategyManager
@@ -26,6 +45,17 @@ from .utils.health import HealthChecker
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+# Un día en nanosegundos, para aritmética de rangos sin objetos datetime
+_DAY_NS = 86_400_000_000_000
+
+def now_ns() -> int:
+    """Timestamp actual en nanosegundos (entero, sin alocar datetime)"""
+    return time.time_ns()
+
+def ns_to_dt(ns: int) -> datetime:
+    """Convierte nanosegundos a datetime (solo en el borde de conectores)"""
+    return datetime.fromtimestamp(ns / 1e9)
+
 class TradingSystem:
     """
     Sistema principal de trading que coordina todos los componentes
@@ -47,40 +77,85 @@ class TradingSystem:
         
         # Tasks en ejecución
         self.background_tasks = []
+
+        # Límite de evaluaciones de símbolos concurrentes (rate limits)
+        self._eval_semaphore = asyncio.Semaphore(
+            self.config.get('strategy_eval_concurrency', 8)
+        )
+
+        # Universo de símbolos precomputado (constante entre iteraciones
+        # de los loops; se recalcula solo en reload_config)
+        self._all_symbols: tuple = ()
+        self._config_reloaded = asyncio.Event()
+        self._compute_symbol_universe()
+
+        # Executor para la inferencia CPU-bound de estrategias: mantiene
+        # el event loop libre para conectores y API durante la evaluación
+        # (NumPy/Numba liberan el GIL, así que los threads escalan)
+        self._eval_executor = ThreadPoolExecutor(
+            max_workers=min(os.cpu_count() or 4, max(1, len(self._all_symbols))),
+            thread_name_prefix='strategy-eval'
+        )
+
+        # Event loop persistente por thread del executor (ver
+        # _run_ensemble_sync)
+        self._eval_loops = threading.local()
+
+    def _compute_symbol_universe(self):
+        """Materializa la lista de símbolos una sola vez"""
+        symbols = self.config.get('symbols', {})
+        self._all_symbols = tuple(
+            symbols.get('crypto', []) + symbols.get('stocks', [])
+        )
+
+    def reload_config(self, config_path: str = "config/settings.yaml"):
+        """Recarga configuración y notifica a los loops de background"""
+        self.config = load_config(config_path)
+        self._compute_symbol_universe()
+        self._config_reloaded.set()
+        self._config_reloaded.clear()
+        logger.info("Configuración recargada")
         
+    def _init_components(self):
+        """Construcción síncrona de componentes y la app FastAPI"""
+        # Configurar logging
+        setup_logging(self.config.get('monitoring', {}).get('logging', {}))
+
+        # Inicializar componentes
+        self.data_manager = DataManager(self.config.get('data_sources', {}))
+        self.strategy_manager = StrategyManager(self.config.get('strategies', {}))
+        self.alert_manager = AlertManager(self.config.get('alerts', {}))
+        self.risk_manager = RiskManager(self.config.get('risk_management', {}))
+        self.health_checker = HealthChecker(self.config.get('monitoring', {}))
+
+        # Crear FastAPI app
+        self._create_app()
+
     async def initialize(self):
         """Inicializa todos los componentes del sistema"""
         logger.info("Inicializando Sistema Consolidado de Trading...")
-        
+
         try:
-            # Configurar logging
-            setup_logging(self.config.get('monitoring', {}).get('logging', {}))
-            
-            # Inicializar componentes
-            self.data_manager = DataManager(self.config.get('data_sources', {}))
-            self.strategy_manager = StrategyManager(self.config.get('strategies', {}))
-            self.alert_manager = AlertManager(self.config.get('alerts', {}))
-            self.risk_manager = RiskManager(self.config.get('risk_management', {}))
-            self.health_checker = HealthChecker(self.config.get('monitoring', {}))
-            
+            self._init_components()
+
             # Inicializar sistemas asíncronos
             await self.alert_manager.start()
-            
-            # Crear FastAPI app
-            self._create_app()
-            
+
             logger.info("Sistema inicializado exitosamente")
-            
+
         except Exception as e:
             logger.error(f"Error inicializando sistema: {e}")
             raise
     
     def _create_app(self):
         """Crea la aplicación FastAPI"""
+        # orjson serializa los payloads de floats por símbolo en C;
+        # fallback a JSONResponse estándar si no está instalado
         self.app = FastAPI(
             title="Sistema Consolidado de Trading",
             description="Sistema unificado de trading con RL/ML y alertas",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=_ResponseClass
         )
         
         # Configurar CORS
@@ -133,13 +208,8 @@ class TradingSystem:
                 await self.initialize()
             
             # Iniciar feeds de datos en tiempo real
-            symbols = self.config.get('symbols', {})
-            crypto_symbols = symbols.get('crypto', [])
-            stock_symbols = symbols.get('stocks', [])
-            all_symbols = crypto_symbols + stock_symbols
-            
-            if all_symbols:
-                await self.data_manager.start_realtime_feeds(all_symbols)
+            if self._all_symbols:
+                await self.data_manager.start_realtime_feeds(list(self._all_symbols))
             
             # Iniciar tareas de background
             await self._start_background_tasks()
@@ -186,24 +256,18 @@ class TradingSystem:
         
         while self.running:
             try:
-                # Obtener símbolos configurados
-                symbols = self.config.get('symbols', {})
-                all_symbols = symbols.get('crypto', []) + symbols.get('stocks', [])
-                
+                # Universo precomputado: sin dict walks por iteración
+                all_symbols = self._all_symbols
+
                 if not all_symbols:
                     await asyncio.sleep(60)
                     continue
-                
-                # Obtener datos en tiempo real
-                realtime_data = await self.data_manager.get_realtime_data(all_symbols)
-                
-                # Procesar datos y generar señales si es necesario
-                for symbol, data in realtime_data.items():
-                    if not data.empty:
-                        # Aquí se podría generar señales automáticamente
-                        # según configuración
-                        pass
-                
+
+                # Refrescar ring buffers y estado streaming: una request
+                # batch por fuente + updates O(1); los consumidores
+                # (triggers, estrategias) leen estos caches en memoria
+                await self.data_manager.get_realtime_data(list(all_symbols))
+
                 # Esperar antes del siguiente ciclo
                 await asyncio.sleep(10)  # 10 segundos
                 
@@ -217,46 +281,16 @@ class TradingSystem:
         
         while self.running:
             try:
-                # Obtener símbolos y datos
-                symbols = self.config.get('symbols', {})
-                all_symbols = symbols.get('crypto', []) + symbols.get('stocks', [])
-                
-                for symbol in all_symbols:
-                    try:
-                        # Obtener datos históricos recientes
-                        end_date = datetime.now()
-                        start_date = end_date - timedelta(days=1)  # Último día
-                        
-                        historical_data = await self.data_manager.get_historical_data(
-                            symbol=symbol,
-                            timeframe='1h',
-                            start_date=start_date,
-                            end_date=end_date
-                        )
-                        
-                        if not historical_data.empty:
-                            # Obtener señales de ensemble
-                            signal, confidence, metadata = await self.strategy_manager.get_ensemble_signal(
-                                symbol, historical_data
-                            )
-                            
-                            # Si la señal es fuerte, podría generar alerta
-                            if confidence > 0.8:
-                                await self.alert_manager.create_alert(
-                                    title=f"Señal {signal.signal_type.value} para {symbol}",
-                                    message=f"Confianza: {confidence:.2%}, Fuerza: {signal.strength:.2f}",
-                                    symbol=symbol,
-                                    metadata={
-                                        'signal_type': signal.signal_type.value,
-                                        'confidence': confidence,
-                                        'strength': signal.strength,
-                                        'ensemble_metadata': metadata
-                                    }
-                                )
-                                
-                    except Exception as e:
-                        logger.error(f"Error evaluando estrategias para {symbol}: {e}")
-                
+                # Universo precomputado: sin dict walks por iteración
+                all_symbols = self._all_symbols
+
+                # Evaluar todos los símbolos en paralelo: el trabajo es
+                # I/O-bound e independiente entre símbolos
+                await asyncio.gather(
+                    *(self._evaluate_symbol(symbol) for symbol in all_symbols),
+                    return_exceptions=True
+                )
+
                 # Esperar antes del siguiente ciclo
                 await asyncio.sleep(300)  # 5 minutos
                 
@@ -264,6 +298,73 @@ class TradingSystem:
                 logger.error(f"Error en loop de estrategias: {e}")
                 await asyncio.sleep(60)
     
+    async def _evaluate_symbol(self, symbol: str):
+        """Evalúa estrategias para un símbolo (acotado por semáforo)"""
+        async with self._eval_semaphore:
+            try:
+                # Preferir el frame de features mantenido en
+                # streaming; solo refetchear en cold start
+                historical_data = self.data_manager.get_recent_features(symbol)
+
+                if historical_data is None or historical_data.empty:
+                    # Último día: aritmética en enteros de nanosegundos,
+                    # datetime recién en el borde del conector
+                    end_ns = now_ns()
+                    start_ns = end_ns - _DAY_NS
+
+                    historical_data = await self.data_manager.get_historical_data(
+                        symbol=symbol,
+                        timeframe='1h',
+                        start_date=ns_to_dt(start_ns),
+                        end_date=ns_to_dt(end_ns)
+                    )
+
+                if not historical_data.empty:
+                    # Obtener señales de ensemble en el executor: la
+                    # inferencia no bloquea el event loop principal
+                    loop = asyncio.get_running_loop()
+                    signal, confidence, metadata = await loop.run_in_executor(
+                        self._eval_executor,
+                        self._run_ensemble_sync,
+                        symbol,
+                        historical_data
+                    )
+
+                    # Si la señal es fuerte, podría generar alerta
+                    if confidence > 0.8:
+                        await self.alert_manager.create_alert(
+                            title=f"Señal {signal.signal_type.value} para {symbol}",
+                            message=f"Confianza: {confidence:.2%}, Fuerza: {signal.strength:.2f}",
+                            symbol=symbol,
+                            metadata={
+                                'signal_type': signal.signal_type.value,
+                                'confidence': confidence,
+                                'strength': signal.strength,
+                                'ensemble_metadata': metadata
+                            }
+                        )
+
+            except Exception as e:
+                logger.error(f"Error evaluando estrategias para {symbol}: {e}")
+
+    def _run_ensemble_sync(self, symbol: str, data):
+        """
+        Ejecuta la evaluación de ensemble en el thread del executor
+
+        Las estrategias exponen API async pero su trabajo es CPU-bound
+        (inferencia ML/NumPy): correrlas en un loop propio del thread
+        evita congelar el loop principal durante la evaluación. El
+        loop es persistente por thread (asyncio.run crearía y
+        destruiría uno por símbolo por ciclo).
+        """
+        loop = getattr(self._eval_loops, 'loop', None)
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._eval_loops.loop = loop
+        return loop.run_until_complete(
+            self.strategy_manager.get_ensemble_signal(symbol, data)
+        )
+
     async def _alert_trigger_loop(self):
         """Loop de verificación de triggers de alertas"""
         logger.info("Iniciado loop de triggers de alertas")
@@ -296,24 +397,50 @@ class TradingSystem:
     
     async def _get_current_market_data(self) -> Dict[str, Any]:
         """Obtiene datos actuales del mercado para triggers"""
-        symbols = self.config.get('symbols', {})
-        all_symbols = symbols.get('crypto', []) + symbols.get('stocks', [])
-        
+        all_symbols = self._all_symbols
+
         market_data = {}
-        
-        for symbol in all_symbols[:5]:  # Limitar a 5 símbolos para evitar rate limits
+
+        # Servir desde el ring buffer (el monitor lo refresca cada 10s);
+        # solo fetchear los símbolos que aún no tienen snapshot. Con el
+        # fetch batch por fuente ya no hace falta recortar el universo
+        # para cuidar el rate limit
+        cold_symbols = []
+        for symbol in all_symbols:
+            latest = self.data_manager.get_latest_values(symbol)
+            if latest is not None:
+                # El ring buffer guarda el timestamp como epoch-ms
+                # float; normalizar a datetime para que ambos caminos
+                # expongan el mismo tipo a los triggers
+                ts_ms = latest.get('timestamp')
+                market_data[symbol] = {
+                    'price': latest.get('close'),
+                    'volume': latest.get('volume'),
+                    'timestamp': (
+                        datetime.fromtimestamp(ts_ms / 1000.0)
+                        if ts_ms is not None and not math.isnan(ts_ms)
+                        else None
+                    )
+                }
+            else:
+                cold_symbols.append(symbol)
+
+        if cold_symbols:
             try:
-                realtime_data = await self.data_manager.get_realtime_data([symbol])
-                if symbol in realtime_data and not realtime_data[symbol].empty:
-                    latest = realtime_data[symbol].iloc[-1]
+                realtime_data = await self.data_manager.get_realtime_data(cold_symbols)
+            except Exception as e:
+                logger.error(f"Error obteniendo datos para {cold_symbols}: {e}")
+                realtime_data = {}
+
+            for symbol, frame in realtime_data.items():
+                if not frame.empty:
+                    latest = frame.iloc[-1]
                     market_data[symbol] = {
                         'price': latest['close'],
                         'volume': latest['volume'],
                         'timestamp': latest['timestamp']
                     }
-            except Exception as e:
-                logger.error(f"Error obteniendo datos para {symbol}: {e}")
-        
+
         return market_data
     
     async def stop(self):
@@ -337,6 +464,8 @@ class TradingSystem:
             await self.data_manager.stop_realtime_feeds()
             await self.alert_manager.stop()
             await self.data_manager.cleanup()
+
+            self._eval_executor.shutdown(wait=False)
             
             logger.info("Sistema detenido exitosamente")
             
@@ -346,18 +475,69 @@ class TradingSystem:
     def run_server(self):
         """Ejecuta el servidor API"""
         api_config = self.config.get('api', {})
-        
-        uvicorn.run(
-            self.app,
-            host=api_config.get('host', '0.0.0.0'),
-            port=api_config.get('port', 8000),
-            workers=api_config.get('workers', 1),
-            log_level=self.config.get('app', {}).get('log_level', 'INFO').lower()
-        )
+        workers = api_config.get('workers', 1)
+        host = api_config.get('host', '0.0.0.0')
+        port = api_config.get('port', 8000)
+        log_level = self.config.get('app', {}).get('log_level', 'INFO').lower()
+        loop_impl = 'uvloop' if _HAS_UVLOOP else 'auto'
+
+        if workers > 1:
+            # uvicorn ignora `workers` cuando recibe una instancia de
+            # app: para multi-proceso real hay que pasar un import
+            # string + factory, y cada worker construye la suya
+            uvicorn.run(
+                "src.main:create_app",
+                factory=True,
+                host=host,
+                port=port,
+                workers=workers,
+                log_level=log_level,
+                loop=loop_impl
+            )
+        else:
+            uvicorn.run(
+                self.app,
+                host=host,
+                port=port,
+                log_level=log_level,
+                loop=loop_impl
+            )
 
 # Instancia global del sistema
 trading_system = None
 
+def create_app() -> FastAPI:
+    """
+    Factory de app para uvicorn multi-proceso (import string)
+
+    Cada worker construye su propia instancia; los loops de background
+    corren solo en el proceso marcado como líder (TRADING_LEADER=1)
+    para no duplicar feeds ni evaluaciones. El estado compartido entre
+    workers va por el cache Redis del DataManager.
+    """
+    # Requiere Python >= 3.10: la construcción corre fuera del loop de
+    # uvicorn y las primitivas asyncio creadas acá (colas de alertas y
+    # storage, semáforo de evaluación) recién se atan a un loop en el
+    # primer await, ya dentro del loop del worker
+    system = TradingSystem()
+    system._init_components()
+
+    async def _startup():
+        await system.alert_manager.start()
+        if os.environ.get('TRADING_LEADER', '0') == '1':
+            await system.start()
+
+    async def _shutdown():
+        if system.running:
+            await system.stop()
+        else:
+            await system.alert_manager.stop()
+
+    system.app.add_event_handler("startup", _startup)
+    system.app.add_event_handler("shutdown", _shutdown)
+
+    return system.app
+
 async def startup_handler():
     """Handler de startup para FastAPI"""
     global trading_system
@@ -407,4 +587,6 @@ async def main():
             await trading_system.stop()
 
 if __name__ == "__main__":
+    if _HAS_UVLOOP:
+        uvloop.install()
     asyncio.run(main())
\ No newline at end of file
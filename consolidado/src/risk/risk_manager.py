@@ -4,27 +4,37 @@ Integra todas las funciones de control de riesgo
 """
 
 import logging
+import time
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from enum import Enum
+from dataclasses import dataclass, field
+from enum import IntEnum
 import pandas as pd
 import numpy as np
 
 from .position_sizer import PositionSizer
-from .portfolio_manager import PortfolioManager  
+from .portfolio_manager import PortfolioManager
 from .risk_metrics import RiskMetrics
+from ._kernels import risk_score as _risk_score_kernel
+from ._kernels import trade_levels as _trade_levels_kernel
+from ._kernels import risk_metrics as _risk_metrics_kernel
 
 logger = logging.getLogger(__name__)
 
-class RiskLevel(Enum):
-    """Niveles de riesgo"""
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
+class RiskLevel(IntEnum):
+    """
+    Niveles de riesgo, ordenados por severidad
+
+    IntEnum: las comparaciones son enteras (>= HIGH en vez de
+    membership sobre una lista de enums) y el valor sirve directo
+    como índice en los arrays SoA
+    """
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    CRITICAL = 3
 
-@dataclass
+@dataclass(slots=True)
 class RiskAssessment:
     """Evaluación de riesgo"""
     overall_risk: RiskLevel
@@ -35,7 +45,110 @@ class RiskAssessment:
     warnings: List[str]
     metadata: Dict[str, Any]
 
-@dataclass
+# Niveles ordenados por score: indexables por entero desde los arrays.
+# searchsorted con side='left' reproduce los cortes <=25/<=50/<=75
+_RISK_LEVELS = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL)
+_RISK_THRESHOLDS = np.array([25.0, 50.0, 75.0])
+
+# Record compacto para el historial de trades: 21 bytes empaquetados
+# por trade en vez de un dict de objetos Python
+_TRADE_DTYPE = np.dtype([
+    ('ts', 'i8'),     # timestamp en nanosegundos
+    ('sym', 'i4'),    # id interno del símbolo
+    ('side', 'i1'),   # +1 compra, -1 venta
+    ('size', 'f4'),
+    ('price', 'f4'),
+    ('pnl', 'f4'),
+])
+
+@dataclass(slots=True)
+class RiskAssessmentBatch:
+    """
+    Evaluación de riesgo de un batch de símbolos en formato SoA
+
+    Arrays NumPy paralelos (una posición por símbolo) en vez de un
+    objeto RiskAssessment por símbolo: las operaciones aguas abajo
+    (stops, sizing) trabajan sobre columnas contiguas. La API legacy
+    por símbolo se obtiene con assessment(), que materializa el
+    dataclass singular solo cuando se necesita.
+    """
+    symbols: Tuple[str, ...]
+    risk_level_idx: np.ndarray   # int8: índice en _RISK_LEVELS
+    risk_score: np.ndarray       # float32
+    max_position_size: np.ndarray  # float32
+    volatility: np.ndarray       # float32
+    sharpe_ratio: np.ndarray     # float32
+    max_drawdown: np.ndarray     # float32
+    var_95: np.ndarray           # float32
+    timestamp: datetime
+    _index: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def assessment(self, symbol: str) -> Optional[RiskAssessment]:
+        """Vista legacy: materializa un RiskAssessment para un símbolo"""
+        i = self._index.get(symbol)
+        if i is None:
+            return None
+
+        volatility = float(self.volatility[i])
+        max_drawdown = float(self.max_drawdown[i])
+        sharpe_ratio = float(self.sharpe_ratio[i])
+
+        warnings = []
+        if volatility > 0.05:
+            warnings.append(f"Alta volatilidad detectada: {volatility:.2%}")
+        if max_drawdown > 0.15:
+            warnings.append(f"Drawdown significativo: {max_drawdown:.2%}")
+        if sharpe_ratio < 0:
+            warnings.append("Sharpe ratio negativo - rendimiento ajustado por riesgo pobre")
+
+        return RiskAssessment(
+            overall_risk=_RISK_LEVELS[int(self.risk_level_idx[i])],
+            risk_score=float(self.risk_score[i]),
+            max_position_size=float(self.max_position_size[i]),
+            stop_loss_level=None,
+            take_profit_level=None,
+            warnings=warnings,
+            metadata={
+                'volatility': volatility,
+                'sharpe_ratio': sharpe_ratio,
+                'max_drawdown': max_drawdown,
+                'var_95': float(self.var_95[i]),
+                'symbol': symbol,
+                'timestamp': self.timestamp
+            }
+        )
+
+# Warnings diferidos del camino de validación: el hot path encola
+# (código, args) y el formateo de floats a string se paga solo si
+# alguien consume el warning (render_warnings)
+WARN_SIZE_REDUCED = 1
+WARN_LOW_RR = 2
+WARN_HIGH_RISK_SCALE = 3
+
+_WARN_TEMPLATES = {
+    WARN_SIZE_REDUCED: "Tamaño reducido de {0} a {1} por gestión de riesgo",
+    WARN_LOW_RR: "Ratio riesgo/beneficio {0:.2f} menor al mínimo {1}",
+    WARN_HIGH_RISK_SCALE: "Tamaño reducido 50% por condiciones adversas de mercado",
+}
+
+def render_warnings(warnings: List[Any]) -> List[str]:
+    """Formatea warnings diferidos (código, args) a strings legibles"""
+    rendered = []
+    for warning in warnings:
+        if isinstance(warning, str):
+            rendered.append(warning)
+        else:
+            code = warning[0]
+            rendered.append(_WARN_TEMPLATES[code].format(*warning[1:]))
+    return rendered
+
+@dataclass(slots=True)
 class TradeValidation:
     """Resultado de validación de trade"""
     approved: bool
@@ -44,7 +157,7 @@ class TradeValidation:
     take_profit: Optional[float]
     risk_reward_ratio: Optional[float]
     rejection_reason: Optional[str]
-    warnings: List[str]
+    warnings: List[Any]  # strings o tuplas diferidas (ver render_warnings)
 
 class RiskManager:
     """
@@ -70,16 +183,103 @@ class RiskManager:
         self.default_stop_loss_pct = config.get('default_stop_loss_pct', 0.02)  # 2%
         self.trailing_stop_enabled = config.get('trailing_stop_enabled', True)
         self.trailing_stop_distance = config.get('trailing_stop_distance', 0.01)  # 1%
+
+        # Constantes derivadas de config, hoisteadas una vez: la config
+        # es inmutable durante la vida del RiskManager, así que los
+        # .get() por llamada en los caminos calientes eran puro overhead
+        self.min_risk_reward_ratio = float(config.get('min_risk_reward_ratio', 1.5))
+        self.max_single_position_pct = float(config.get('max_single_position_pct', 0.20))
+        self.base_position_pct = float(config.get('base_position_pct', 0.05))
+        self.default_tp_ratio = float(config.get('default_take_profit_ratio', 2.0))
+
+        # Multiplicador de tamaño por nivel, indexado por el índice del
+        # nivel en _RISK_LEVELS (LOW..CRITICAL)
+        self._risk_multipliers = np.array([1.5, 1.0, 0.7, 0.3], dtype=np.float32)
+
+        # Evaluadores de niveles especializados por lado: cada closure
+        # captura el signo y las constantes de config, así el camino
+        # por trade no re-resuelve el string del lado ni los defaults
+        self._level_fns = {
+            'buy': self._make_level_fn(1.0),
+            'sell': self._make_level_fn(-1.0),
+        }
         
         # Estado del portfolio
         self.current_positions = {}
         self.daily_pnl = 0.0
         self.max_drawdown_reached = 0.0
-        
-        # Historial de trades para análisis
-        self.trade_history = []
-        
-    async def validate_trade(
+
+        # Exposición total mantenida incrementalmente: las posiciones
+        # cambian solo en fills, así que re-sumarlas en cada validación
+        # era O(N posiciones) redundante
+        self._total_exposure = 0.0
+
+        # Frontera de medianoche cacheada en ns: los trades del día se
+        # cuentan contra el ring buffer de trades registrados (fills
+        # reales vía record_trade, no validaciones aprobadas)
+        self._today = datetime.now().date()
+        self._midnight_ns = self._compute_midnight_ns(self._today)
+
+        # Cache de evaluaciones de mercado: varias estrategias suelen
+        # validar el mismo símbolo dentro del mismo tick con la misma
+        # cola de datos; reusar la evaluación evita repetir el escaneo
+        self._risk_cache: Dict[Tuple[str, int, float], Tuple[float, RiskAssessment]] = {}
+        self._risk_cache_ttl = float(config.get('risk_cache_ttl', 1.0))
+
+        # Historial de trades para análisis: ring buffer de records
+        # NumPy con capacidad fija (memoria acotada; los escaneos son
+        # comparaciones vectorizadas sobre un array contiguo)
+        history_capacity = int(config.get('trade_history_capacity', 65536))
+        self._trades = np.zeros(history_capacity, dtype=_TRADE_DTYPE)
+        self._trade_cursor = 0
+        self._trade_count = 0
+        self._symbol_ids: Dict[str, int] = {}
+
+    def _make_level_fn(self, side_sign: float):
+        """
+        Fábrica de evaluadores de niveles especializados por lado
+        (evaluación parcial: signo y constantes quedan ligados una vez)
+        """
+        default_sl = self.default_stop_loss_pct
+        tp_ratio = self.default_tp_ratio
+
+        def levels(price: float, volatility: float) -> Tuple[float, float, float]:
+            return _trade_levels_kernel(
+                price, side_sign, volatility, default_sl, tp_ratio
+            )
+
+        return levels
+
+    def update_position(self, symbol: str, new_size: float, new_price: float):
+        """
+        Actualiza una posición y ajusta la exposición total en O(1)
+        (llamar en cada fill; tamaño 0 cierra la posición)
+        """
+        old = self.current_positions.get(symbol)
+        old_value = old.get('size', 0) * old.get('price', 0) if old else 0.0
+
+        if new_size == 0:
+            self.current_positions.pop(symbol, None)
+            new_value = 0.0
+        else:
+            self.current_positions[symbol] = {'size': new_size, 'price': new_price}
+            new_value = new_size * new_price
+
+        self._total_exposure += new_value - old_value
+
+    @staticmethod
+    def _compute_midnight_ns(day) -> int:
+        """Medianoche local del día en nanosegundos epoch"""
+        return int(datetime.combine(day, datetime.min.time()).timestamp() * 1e9)
+
+    def _roll_daily_counters(self):
+        """Refresca la frontera de medianoche al cruzar de día"""
+        today = datetime.now().date()
+        if today != self._today:
+            self._today = today
+            self._midnight_ns = self._compute_midnight_ns(today)
+        
+    def validate_trade(
         self,
         symbol: str,
         side: str,  # 'buy' or 'sell'
@@ -108,7 +308,7 @@ class RiskManager:
         
         try:
             # 1. Verificar límites básicos de portfolio
-            portfolio_check = await self._check_portfolio_limits(
+            portfolio_check = self._check_portfolio_limits(
                 portfolio_value, current_positions
             )
             if not portfolio_check['approved']:
@@ -122,35 +322,37 @@ class RiskManager:
                     warnings=warnings
                 )
             
-            # 2. Calcular tamaño de posición óptimo
-            risk_assessment = await self.assess_market_risk(symbol, market_data)
-            
+            # 2. Calcular tamaño de posición óptimo (la volatilidad se
+            # lee del metadata una sola vez para sizing y niveles)
+            risk_assessment = self.assess_market_risk(symbol, market_data)
+            volatility = risk_assessment.metadata.get('volatility', 0.02)
+
             optimal_size = self.position_sizer.calculate_position_size(
                 portfolio_value=portfolio_value,
                 risk_per_trade=self.max_single_position_risk,
                 stop_loss_distance=self.default_stop_loss_pct,
-                volatility=risk_assessment.metadata.get('volatility', 0.02)
+                volatility=volatility
             )
             
             # 3. Ajustar tamaño si es necesario
             final_size = min(intended_size, optimal_size)
             
             if final_size < intended_size:
-                warnings.append(f"Tamaño reducido de {intended_size} a {final_size} por gestión de riesgo")
+                warnings.append((WARN_SIZE_REDUCED, intended_size, final_size))
             
-            # 4. Calcular stop-loss y take-profit
-            stop_loss = self._calculate_stop_loss(current_price, side, risk_assessment)
-            take_profit = self._calculate_take_profit(current_price, side, risk_assessment)
-            
-            # 5. Calcular ratio riesgo/beneficio
-            risk_reward_ratio = self._calculate_risk_reward_ratio(
-                current_price, stop_loss, take_profit, side
+            # 4-5. Stop-loss y take-profit con el evaluador
+            # pre-especializado para el lado. El ratio R/R es
+            # default_tp_ratio por construcción (ver _kernels), así que
+            # no hay nada que computar
+            stop_loss, take_profit, _ = self._level_fns[side](
+                current_price, volatility
             )
+            risk_reward_ratio = self.default_tp_ratio
             
             # 6. Verificar ratio mínimo
-            min_risk_reward = self.config.get('min_risk_reward_ratio', 1.5)
+            min_risk_reward = self.min_risk_reward_ratio
             if risk_reward_ratio and risk_reward_ratio < min_risk_reward:
-                warnings.append(f"Ratio riesgo/beneficio {risk_reward_ratio:.2f} menor al mínimo {min_risk_reward}")
+                warnings.append((WARN_LOW_RR, risk_reward_ratio, min_risk_reward))
             
             # 7. Verificaciones finales
             concentration_check = self._check_concentration_risk(
@@ -174,9 +376,9 @@ class RiskManager:
                 warnings.extend(market_check['warnings'])
                 
                 # En condiciones adversas, reducir tamaño
-                if risk_assessment.overall_risk in [RiskLevel.HIGH, RiskLevel.CRITICAL]:
+                if risk_assessment.overall_risk >= RiskLevel.HIGH:
                     final_size *= 0.5
-                    warnings.append("Tamaño reducido 50% por condiciones adversas de mercado")
+                    warnings.append((WARN_HIGH_RISK_SCALE,))
             
             return TradeValidation(
                 approved=True,
@@ -200,7 +402,7 @@ class RiskManager:
                 warnings=warnings
             )
     
-    async def _check_portfolio_limits(
+    def _check_portfolio_limits(
         self, 
         portfolio_value: float, 
         current_positions: Dict[str, Any]
@@ -221,12 +423,17 @@ class RiskManager:
                 'reason': f"Drawdown máximo alcanzado: {self.max_drawdown_reached:.2%}"
             }
         
-        # Verificar exposición total
-        total_exposure = sum(
-            pos.get('size', 0) * pos.get('price', 0) 
-            for pos in current_positions.values()
-        )
-        
+        # Verificar exposición total (agregado mantenido en O(1) por
+        # update_position; el dict de posiciones queda como fallback
+        # para callers que trackean posiciones por fuera)
+        if current_positions is self.current_positions:
+            total_exposure = self._total_exposure
+        else:
+            total_exposure = sum(
+                pos.get('size', 0) * pos.get('price', 0)
+                for pos in current_positions.values()
+            )
+
         max_exposure = portfolio_value * 0.95  # 95% máximo
         if total_exposure > max_exposure:
             return {
@@ -257,16 +464,55 @@ class RiskManager:
         total_position_value = existing_value + position_value
         
         # Verificar concentración por símbolo
-        max_single_position_value = portfolio_value * self.config.get('max_single_position_pct', 0.20)
+        max_single_position_value = portfolio_value * self.max_single_position_pct
         
         if total_position_value > max_single_position_value:
             return {
                 'approved': False,
                 'reason': f"Concentración excesiva en {symbol}: {total_position_value:.2f} > {max_single_position_value:.2f}"
             }
-        
+
         return {'approved': True}
-    
+
+    def check_concentration_risk_batch(
+        self,
+        symbols: List[str],
+        sizes: np.ndarray,
+        prices: np.ndarray,
+        portfolio_value: float,
+        current_positions: Optional[Dict[str, Any]] = None
+    ) -> Tuple[np.ndarray, Dict[int, str]]:
+        """
+        Riesgo de concentración para un batch de trades candidatos
+
+        Versión vectorizada de _check_concentration_risk: una sola
+        comparación sobre arrays paralelos en vez de N lookups de dict
+        por trade. Devuelve la máscara de aprobación y un dict
+        índice -> razón construido solo para los rechazados.
+        """
+        if current_positions is None:
+            current_positions = self.current_positions
+
+        # Valor existente por símbolo, extraído del dict una sola vez
+        existing_value = np.array([
+            current_positions.get(s, {}).get('size', 0)
+            * current_positions.get(s, {}).get('price', 0)
+            for s in symbols
+        ], dtype=np.float64)
+
+        new_total = existing_value + np.asarray(sizes) * np.asarray(prices)
+        cap = portfolio_value * self.max_single_position_pct
+        approved = new_total <= cap
+
+        reasons: Dict[int, str] = {}
+        for i in np.flatnonzero(~approved):
+            reasons[int(i)] = (
+                f"Concentración excesiva en {symbols[i]}: "
+                f"{new_total[i]:.2f} > {cap:.2f}"
+            )
+
+        return approved, reasons
+
     def _check_market_conditions(self, risk_assessment: RiskAssessment) -> Dict[str, Any]:
         """Verifica condiciones generales de mercado"""
         warnings = []
@@ -281,7 +527,7 @@ class RiskManager:
             'warnings': warnings
         }
     
-    async def assess_market_risk(
+    def assess_market_risk(
         self, 
         symbol: str, 
         market_data: pd.DataFrame
@@ -293,35 +539,39 @@ class RiskManager:
             RiskAssessment con evaluación completa
         """
         try:
+            close = market_data['close']
+
+            # Cache hit: mismo símbolo, mismo largo y mismo último
+            # cierre dentro del TTL => los datos no cambiaron (varias
+            # estrategias validan el mismo símbolo en el mismo tick)
+            cache_key = (
+                symbol, len(close), float(close.iloc[-1]) if len(close) else 0.0
+            )
+            now_mono = time.monotonic()
+            cached = self._risk_cache.get(cache_key)
+            if cached is not None and now_mono - cached[0] < self._risk_cache_ttl:
+                return cached[1]
+
             # Calcular métricas de riesgo
-            volatility = self.risk_metrics.calculate_volatility(market_data['close'])
-            sharpe_ratio = self.risk_metrics.calculate_sharpe_ratio(market_data['close'])
-            max_drawdown = self.risk_metrics.calculate_max_drawdown(market_data['close'])
-            var_95 = self.risk_metrics.calculate_var(market_data['close'], confidence=0.95)
+            # Una sola extracción a ndarray contiguo y un solo kernel
+            # fusionado, en vez de cuatro recorridos de Series pandas
+            close_arr = np.ascontiguousarray(close.to_numpy(dtype=np.float64))
+            volatility, sharpe_ratio, max_drawdown, var_95 = (
+                _risk_metrics_kernel(close_arr)
+            )
             
             # Calcular score de riesgo (0-100)
             risk_score = self._calculate_risk_score(volatility, sharpe_ratio, max_drawdown, var_95)
             
-            # Determinar nivel de riesgo
-            if risk_score <= 25:
-                risk_level = RiskLevel.LOW
-            elif risk_score <= 50:
-                risk_level = RiskLevel.MEDIUM
-            elif risk_score <= 75:
-                risk_level = RiskLevel.HIGH
-            else:
-                risk_level = RiskLevel.CRITICAL
-            
-            # Calcular tamaño máximo de posición basado en riesgo
-            base_position_pct = self.config.get('base_position_pct', 0.05)
-            risk_multiplier = {
-                RiskLevel.LOW: 1.5,
-                RiskLevel.MEDIUM: 1.0,
-                RiskLevel.HIGH: 0.7,
-                RiskLevel.CRITICAL: 0.3
-            }
-            
-            max_position_size = base_position_pct * risk_multiplier[risk_level]
+            # Determinar nivel de riesgo: lookup sin branches contra
+            # los umbrales precomputados
+            level_idx = int(np.searchsorted(_RISK_THRESHOLDS, risk_score))
+            risk_level = _RISK_LEVELS[level_idx]
+
+            # Tamaño máximo de posición según nivel de riesgo
+            max_position_size = float(
+                self.base_position_pct * self._risk_multipliers[level_idx]
+            )
             
             # Generar warnings
             warnings = []
@@ -334,7 +584,7 @@ class RiskManager:
             if sharpe_ratio < 0:
                 warnings.append("Sharpe ratio negativo - rendimiento ajustado por riesgo pobre")
             
-            return RiskAssessment(
+            assessment = RiskAssessment(
                 overall_risk=risk_level,
                 risk_score=risk_score,
                 max_position_size=max_position_size,
@@ -350,7 +600,17 @@ class RiskManager:
                     'timestamp': datetime.now()
                 }
             )
-            
+
+            # Poblar cache, descartando entradas vencidas si creció
+            if len(self._risk_cache) > 512:
+                self._risk_cache = {
+                    key: entry for key, entry in self._risk_cache.items()
+                    if now_mono - entry[0] < self._risk_cache_ttl
+                }
+            self._risk_cache[cache_key] = (now_mono, assessment)
+
+            return assessment
+
         except Exception as e:
             logger.error(f"Error evaluando riesgo de mercado: {e}")
             # Retornar evaluación conservadora en caso de error
@@ -364,111 +624,187 @@ class RiskManager:
                 metadata={'error': str(e)}
             )
     
+    def assess_market_risk_batch(
+        self,
+        symbol_to_closes: Dict[str, np.ndarray]
+    ) -> Optional[RiskAssessmentBatch]:
+        """
+        Evalúa riesgo para muchos símbolos en una sola pasada NumPy
+
+        Apila los cierres en una matriz (N símbolos x T barras) y
+        calcula volatilidad, Sharpe, max drawdown y VaR como
+        reducciones vectorizadas sobre axis=1, en vez de N recorridos
+        de Series de pandas. El resultado queda en formato SoA; usar
+        RiskAssessmentBatch.assessment(symbol) para la vista legacy.
+
+        Returns:
+            RiskAssessmentBatch, o None si ningún símbolo tiene datos
+        """
+        symbols = [s for s, c in symbol_to_closes.items() if len(c) >= 2]
+        if not symbols:
+            return None
+
+        # Recortar al largo mínimo común para poder apilar (se usan
+        # las últimas T barras de cada serie). float32 alcanza para
+        # métricas que terminan en bins 0-100 y porcentajes de stop:
+        # mitad de ancho de banda y el doble de lanes SIMD
+        min_len = min(len(symbol_to_closes[s]) for s in symbols)
+        prices = np.stack([
+            np.asarray(symbol_to_closes[s][-min_len:], dtype=np.float32)
+            for s in symbols
+        ])
+
+        rets = np.diff(np.log(prices), axis=1)
+
+        volatility = rets.std(axis=1)
+        mean_ret = rets.mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(
+                volatility > 0,
+                mean_ret / volatility * np.sqrt(252.0),
+                0.0
+            )
+
+        # Drawdown: máximo retroceso contra el running max de precios
+        running_max = np.maximum.accumulate(prices, axis=1)
+        drawdowns = (running_max - prices) / running_max
+        max_drawdown = drawdowns.max(axis=1)
+
+        var_95 = np.quantile(rets, 0.05, axis=1)
+
+        # Score ponderado: misma fórmula que el kernel escalar, como
+        # ufuncs sobre el batch completo
+        vol_score = np.minimum(volatility / 0.10, 1.0)
+        dd_score = np.minimum(np.abs(max_drawdown) / 0.30, 1.0)
+        var_score = np.minimum(np.abs(var_95) / 0.05, 1.0)
+        sharpe_score = np.maximum(0.0, 1.0 - (sharpe + 1.0) / 3.0)
+        risk_scores = (
+            vol_score * 0.3 +
+            dd_score * 0.25 +
+            var_score * 0.25 +
+            sharpe_score * 0.2
+        ) * 100.0
+
+        # Clasificación sin branches para todo el batch (side='left'
+        # reproduce los cortes <= del camino escalar)
+        level_idx = np.searchsorted(_RISK_THRESHOLDS, risk_scores).astype(np.int8)
+
+        # Multiplicador por nivel indexado por el array de índices
+        max_position_size = self.base_position_pct * self._risk_multipliers[level_idx]
+
+        return RiskAssessmentBatch(
+            symbols=tuple(symbols),
+            risk_level_idx=level_idx,
+            risk_score=risk_scores.astype(np.float32, copy=False),
+            max_position_size=max_position_size,
+            volatility=volatility.astype(np.float32, copy=False),
+            sharpe_ratio=sharpe.astype(np.float32, copy=False),
+            max_drawdown=max_drawdown.astype(np.float32, copy=False),
+            var_95=var_95.astype(np.float32, copy=False),
+            timestamp=datetime.now()
+        )
+
     def _calculate_risk_score(
-        self, 
-        volatility: float, 
-        sharpe_ratio: float, 
-        max_drawdown: float, 
+        self,
+        volatility: float,
+        sharpe_ratio: float,
+        max_drawdown: float,
         var_95: float
     ) -> float:
         """
         Calcula score de riesgo combinado (0-100, donde 100 = máximo riesgo)
+        Delega en el kernel Numba compilado (ver risk/_kernels.py)
         """
-        # Normalizar métricas a escala 0-1
-        vol_score = min(volatility / 0.10, 1.0)  # >10% vol diaria = máximo
-        drawdown_score = min(abs(max_drawdown) / 0.30, 1.0)  # >30% DD = máximo
-        var_score = min(abs(var_95) / 0.05, 1.0)  # >5% VaR = máximo
-        sharpe_score = max(0, 1 - (sharpe_ratio + 1) / 3)  # Sharpe 2+ = mínimo riesgo
-        
-        # Pesos para cada componente
-        weights = {
-            'volatility': 0.3,
-            'drawdown': 0.25, 
-            'var': 0.25,
-            'sharpe': 0.2
-        }
-        
-        # Score final ponderado
-        total_score = (
-            vol_score * weights['volatility'] +
-            drawdown_score * weights['drawdown'] +
-            var_score * weights['var'] +
-            sharpe_score * weights['sharpe']
-        )
-        
-        return total_score * 100
+        return _risk_score_kernel(volatility, sharpe_ratio, max_drawdown, var_95)
     
     def _calculate_stop_loss(
-        self, 
-        price: float, 
-        side: str, 
+        self,
+        price: float,
+        side: str,
         risk_assessment: RiskAssessment
     ) -> float:
-        """Calcula nivel de stop-loss"""
-        volatility = risk_assessment.metadata.get('volatility', 0.02)
-        
-        # Ajustar stop-loss basado en volatilidad
-        stop_distance = max(self.default_stop_loss_pct, volatility * 1.5)
-        
-        if side == 'buy':
-            return price * (1 - stop_distance)
-        else:  # sell
-            return price * (1 + stop_distance)
-    
+        """Calcula nivel de stop-loss (delega en el kernel fusionado)"""
+        stop_loss, _, _ = self._level_fns[side](
+            price, risk_assessment.metadata.get('volatility', 0.02)
+        )
+        return stop_loss
+
     def _calculate_take_profit(
-        self, 
-        price: float, 
-        side: str, 
+        self,
+        price: float,
+        side: str,
         risk_assessment: RiskAssessment
     ) -> Optional[float]:
-        """Calcula nivel de take-profit"""
-        default_tp_ratio = self.config.get('default_take_profit_ratio', 2.0)
-        
-        # Distancia del stop-loss
-        stop_distance = max(self.default_stop_loss_pct, 
-                          risk_assessment.metadata.get('volatility', 0.02) * 1.5)
-        
-        # Take-profit a múltiplo de la distancia del stop
-        tp_distance = stop_distance * default_tp_ratio
-        
-        if side == 'buy':
-            return price * (1 + tp_distance)
-        else:  # sell
-            return price * (1 - tp_distance)
-    
+        """Calcula nivel de take-profit (delega en el kernel fusionado)"""
+        _, take_profit, _ = self._level_fns[side](
+            price, risk_assessment.metadata.get('volatility', 0.02)
+        )
+        return take_profit
+
     def _calculate_risk_reward_ratio(
-        self, 
-        price: float, 
-        stop_loss: Optional[float], 
-        take_profit: Optional[float], 
+        self,
+        price: float,
+        stop_loss: Optional[float],
+        take_profit: Optional[float],
         side: str
     ) -> Optional[float]:
         """Calcula ratio riesgo/recompensa"""
         if not stop_loss or not take_profit:
             return None
-        
+
         if side == 'buy':
             risk = price - stop_loss
             reward = take_profit - price
         else:  # sell
             risk = stop_loss - price
             reward = price - take_profit
-        
+
         if risk <= 0:
             return None
-        
+
         return reward / risk
     
-    async def update_daily_pnl(self, pnl_change: float):
-        """Actualiza P&L diario"""
+    def record_trade(
+        self,
+        symbol: str,
+        side: str,
+        size: float,
+        price: float,
+        pnl: float = 0.0
+    ):
+        """Registra un trade ejecutado en el ring buffer de historial"""
+        sym_id = self._symbol_ids.setdefault(symbol, len(self._symbol_ids))
+
+        trade = self._trades[self._trade_cursor]
+        trade['ts'] = time.time_ns()
+        trade['sym'] = sym_id
+        trade['side'] = 1 if side == 'buy' else -1
+        trade['size'] = size
+        trade['price'] = price
+        trade['pnl'] = pnl
+
+        self._trade_cursor = (self._trade_cursor + 1) % len(self._trades)
+        self._trade_count = min(self._trade_count + 1, len(self._trades))
+
+    def trades_since(self, ts_ns: int) -> int:
+        """Trades registrados desde un timestamp (compare vectorizado)"""
+        if self._trade_count == 0:
+            return 0
+        return int(np.count_nonzero(
+            self._trades['ts'][:self._trade_count] >= ts_ns
+        ))
+
+    def update_daily_pnl(self, pnl_change: float):
+        """Actualiza P&L diario (sync: no hay I/O que esperar)"""
         self.daily_pnl += pnl_change
-    
-    async def update_drawdown(self, current_drawdown: float):
-        """Actualiza drawdown máximo"""
+
+    def update_drawdown(self, current_drawdown: float):
+        """Actualiza drawdown máximo (sync: no hay I/O que esperar)"""
         self.max_drawdown_reached = max(self.max_drawdown_reached, current_drawdown)
     
     def get_risk_summary(self) -> Dict[str, Any]:
         """Obtiene resumen del estado de riesgo"""
+        self._roll_daily_counters()
         return {
             'daily_pnl': self.daily_pnl,
             'max_drawdown_reached': self.max_drawdown_reached,
@@ -476,8 +812,7 @@ class RiskManager:
             'max_drawdown_limit': self.max_drawdown,
             'max_portfolio_risk': self.max_portfolio_risk,
             'max_single_position_risk': self.max_single_position_risk,
-            'total_trades_today': len([t for t in self.trade_history 
-                                     if t.get('timestamp', datetime.min).date() == datetime.now().date()]),
+            'total_trades_today': self.trades_since(self._midnight_ns),
             'risk_limits_breached': {
                 'daily_loss': self.daily_pnl < -self.max_daily_loss,
                 'max_drawdown': self.max_drawdown_reached > self.max_drawdown
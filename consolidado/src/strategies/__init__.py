@@ -1,21 +1,39 @@
 """
 Strategy Layer - Sistema de estrategias de trading unificado
 Integra RL, ML y estrategias técnicas tradicionales
+
+Los submódulos pesados (torch, stable-baselines3, tensorflow) se
+importan de forma perezosa: importar el paquete no paga el costo de
+cargar frameworks de ML hasta que alguien pide una estrategia concreta
 """
 
-from .strategy_manager import StrategyManager
-from .base_strategy import BaseStrategy
-from .rl_strategies import *
-from .ml_strategies import *
-from .technical_strategies import *
+import importlib
+
+# Nombre exportado -> submódulo que lo define
+_LAZY_MAP = {
+    'StrategyManager': '.strategy_manager',
+    'BaseStrategy': '.base_strategy',
+    'PPOStrategy': '.rl_strategies',
+    'DQNStrategy': '.rl_strategies',
+    'LSTMStrategy': '.ml_strategies',
+    'RSIStrategy': '.technical_strategies',
+    'MACDStrategy': '.technical_strategies',
+    'BollingerBandsStrategy': '.technical_strategies',
+}
+
+__all__ = list(_LAZY_MAP)
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_MAP[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    module = importlib.import_module(module_name, __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # Cachear para accesos posteriores
+    return value
 
-__all__ = [
-    'StrategyManager',
-    'BaseStrategy',
-    'PPOStrategy',
-    'DQNStrategy',
-    'LSTMStrategy',
-    'RSIStrategy',
-    'MACDStrategy',
-    'BollingerBandsStrategy'
-]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_MAP))
@@ -4,23 +4,91 @@ Maneja múltiples estrategias simultáneamente y combina señales
 """
 
 import asyncio
+import importlib
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Any, Tuple
 from datetime import datetime
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
 from enum import Enum
+from numba import njit
 
 from .base_strategy import BaseStrategy, Signal, SignalType
-from .rl_strategies.ppo_strategy import PPOStrategy
-from .rl_strategies.dqn_strategy import DQNStrategy
-from .ml_strategies.lstm_strategy import LSTMStrategy
-from .technical_strategies.rsi_strategy import RSIStrategy
-from .technical_strategies.macd_strategy import MACDStrategy
 
 logger = logging.getLogger(__name__)
 
+# Tipo de estrategia -> (módulo, clase): la importación se difiere a
+# la primera instanciación de un tipo habilitado, igual que el
+# __getattr__ del paquete — importar StrategyManager ya no arrastra
+# torch/TF/stable-baselines3 cuando solo corren estrategias técnicas
+_STRATEGY_MODULES = {
+    'ppo': ('.rl_strategies.ppo_strategy', 'PPOStrategy'),
+    'dqn': ('.rl_strategies.dqn_strategy', 'DQNStrategy'),
+    'lstm': ('.ml_strategies.lstm_strategy', 'LSTMStrategy'),
+    'rsi': ('.technical_strategies.rsi_strategy', 'RSIStrategy'),
+    'macd': ('.technical_strategies.macd_strategy', 'MACDStrategy'),
+}
+
+# Índices densos por tipo de señal para los conteos vectorizados
+# (independiente de los .value del enum)
+_SIGNAL_TO_IDX = {SignalType.BUY: 0, SignalType.SELL: 1, SignalType.HOLD: 2}
+
+# Código con signo por tipo de señal: la dirección queda embebida en
+# el entero (señal = código * strength, sin branches por enum)
+_SIGNAL_TO_SIGN = {SignalType.BUY: 1, SignalType.SELL: -1, SignalType.HOLD: 0}
+
+@njit(cache=True)
+def _voting_core(types, confs, min_conf):
+    """
+    Conteo de votos fusionado en un solo loop compilado
+
+    Devuelve (buy, sell, hold, confianza_total); los resultados bajo
+    el umbral votan HOLD sin aportar confianza
+    """
+    buy = 0
+    sell = 0
+    hold = 0
+    total_conf = 0.0
+    for i in range(types.shape[0]):
+        c = confs[i]
+        if c < min_conf:
+            hold += 1
+            continue
+        if types[i] == 0:
+            buy += 1
+        elif types[i] == 1:
+            sell += 1
+        else:
+            hold += 1
+        total_conf += c
+    return buy, sell, hold, total_conf
+
+@njit(cache=True, fastmath=True)
+def _weighted_core(codes, strengths, confs, static_weights, min_conf):
+    """
+    Acumulador ponderado fusionado: señal con signo por peso final
+    (estático * confianza) en una pasada, sin temporarios NumPy
+
+    codes lleva la dirección como entero con signo (+1/-1/0), así la
+    contribución es una multiplicación sin branches por tipo de señal
+    """
+    weighted_signal = 0.0
+    total_weight = 0.0
+    total_conf = 0.0
+    for i in range(codes.shape[0]):
+        c = confs[i]
+        if c < min_conf:
+            continue
+        w = static_weights[i] * c
+        weighted_signal += codes[i] * strengths[i] * w
+        total_weight += w
+        total_conf += c
+    return weighted_signal, total_weight, total_conf
+
 class EnsembleMethod(Enum):
     """Métodos de combinación de señales"""
     VOTING = "voting"          # Voto mayoritario
@@ -28,9 +96,88 @@ class EnsembleMethod(Enum):
     CONFIDENCE = "confidence"  # Basado en confianza
     BEST_PERFORMER = "best"    # Mejor performer histórico
 
-@dataclass
+class MarketWindow(NamedTuple):
+    """
+    Vistas NumPy zero-copy de la ventana de mercado
+
+    Las estrategias que operan por tick pueden indexar estos arrays
+    directamente en vez de pagar .iloc/.loc de pandas por fila; el
+    DataFrame original sigue disponible para las que necesitan pandas
+    """
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    ts: np.ndarray
+
+class _EnsembleArrays(NamedTuple):
+    """
+    Arrays paralelos de un batch de resultados, construidos una sola
+    vez por get_ensemble_signal y compartidos por los agregadores
+    """
+    names: List[str]
+    types: np.ndarray      # int8: índices densos (_SIGNAL_TO_IDX)
+    codes: np.ndarray      # int8: dirección con signo (_SIGNAL_TO_SIGN)
+    confs: np.ndarray      # float32
+    strengths: np.ndarray  # float32
+
+class FeatureCache:
+    """
+    Cache de indicadores compartido entre estrategias de un mismo tick
+
+    RSI, EMA y MACD se calculan una sola vez por (indicador, período)
+    y se reusan: las estrategias técnicas suelen pedir los mismos
+    indicadores sobre la misma ventana de datos. Se adjunta en
+    data.attrs['feature_cache'] para no cambiar la firma de
+    prepare_data; las estrategias que lo conocen lo consultan antes de
+    recalcular.
+    """
+
+    __slots__ = ('_close', '_cache')
+
+    def __init__(self, close: pd.Series):
+        self._close = close
+        self._cache: Dict[Tuple, Any] = {}
+
+    def ema(self, period: int) -> pd.Series:
+        key = ('ema', period)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._close.ewm(span=period, adjust=False).mean()
+            self._cache[key] = cached
+        return cached
+
+    def rsi(self, period: int = 14) -> pd.Series:
+        key = ('rsi', period)
+        cached = self._cache.get(key)
+        if cached is None:
+            delta = self._close.diff()
+            gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+            loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False).mean()
+            rs = gain / loss.replace(0, np.nan)
+            cached = (100 - 100 / (1 + rs)).fillna(50.0)
+            self._cache[key] = cached
+        return cached
+
+    def macd(
+        self,
+        fast: int = 12,
+        slow: int = 26,
+        signal: int = 9
+    ) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        key = ('macd', fast, slow, signal)
+        cached = self._cache.get(key)
+        if cached is None:
+            macd_line = self.ema(fast) - self.ema(slow)
+            signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+            cached = (macd_line, signal_line, macd_line - signal_line)
+            self._cache[key] = cached
+        return cached
+
+@dataclass(slots=True, frozen=True)
 class StrategyResult:
-    """Resultado de una estrategia"""
+    """Resultado de una estrategia (inmutable, sin __dict__)"""
     strategy_name: str
     signal: Signal
     confidence: float
@@ -51,15 +198,63 @@ class StrategyManager:
         )
         self.strategy_weights = config.get('strategy_weights', {})
         self.min_confidence = config.get('min_confidence', 0.6)
+
+        # 'quorum': get_signals corta apenas la votación queda
+        # matemáticamente decidida y cancela las estrategias lentas
+        self.ensemble_mode = config.get('ensemble_mode', 'full')
         
         # Métricas de performance por estrategia
         self.performance_metrics = {}
         
-        # Cache de señales recientes
-        self.signal_history = {}
-        
+        # Cache de señales recientes: deque acotado por símbolo, las
+        # entradas viejas se descartan solas en vez de acumularse
+        # durante toda la vida del bot
+        history_len = int(config.get('signal_history_len', 1024))
+        self.signal_history: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=history_len)
+        )
+
+        # Memoización del ensemble: en mercados laterales los ticks
+        # consecutivos suelen producir exactamente las mismas salidas
+        # de estrategia, y el ensemble es determinista sobre ellas
+        self._ensemble_cache: Dict[tuple, Tuple[Signal, float, Dict[str, Any]]] = {}
+
+        # El manager se evalúa desde varios threads del executor a la
+        # vez: el cache y el historial son estado compartido mutable
+        # (la evicción check-then-act y el factory del defaultdict no
+        # son atómicos por sí solos)
+        self._state_lock = threading.Lock()
+
+        # Dispatch de ensembles resuelto una vez: un lookup de dict por
+        # tick en vez de la cadena if/elif sobre el enum
+        self._ensemble_dispatch = {
+            EnsembleMethod.VOTING: self._voting_ensemble,
+            EnsembleMethod.WEIGHTED: self._weighted_ensemble,
+            EnsembleMethod.CONFIDENCE: self._confidence_ensemble,
+            EnsembleMethod.BEST_PERFORMER: self._best_performer_ensemble,
+        }
+
         # Inicializar estrategias
         self._init_strategies()
+
+        # Pesos estáticos (peso de config * accuracy histórico) por
+        # estrategia, cacheados en un vector: solo cambian cuando
+        # update_performance recalcula un accuracy
+        self._strategy_index = {name: i for i, name in enumerate(self.strategies)}
+        self._static_weight_vec: Optional[np.ndarray] = None
+
+        # Mejor performer mantenido incrementalmente desde
+        # update_performance, en vez de escanear todas las métricas en
+        # cada llamada al ensemble
+        self._best_performer_name: Optional[str] = None
+        self._best_accuracy = 0.0
+
+        # Warm-compile de los kernels de ensemble con arrays de un
+        # elemento: el primer tick no paga la latencia de JIT
+        _dummy_i8 = np.zeros(1, dtype=np.int8)
+        _dummy_f4 = np.zeros(1, dtype=np.float32)
+        _voting_core(_dummy_i8, _dummy_f4, 0.0)
+        _weighted_core(_dummy_i8, _dummy_f4, _dummy_f4, _dummy_f4, 0.0)
     
     def _init_strategies(self):
         """Inicializa estrategias según configuración"""
@@ -85,22 +280,17 @@ class StrategyManager:
                 logger.error(f"Error inicializando estrategia {strategy_name}: {e}")
     
     def _create_strategy(self, name: str, config: Dict[str, Any]) -> Optional[BaseStrategy]:
-        """Factory para crear estrategias"""
+        """Factory para crear estrategias (import lazy por tipo)"""
         strategy_type = config.get('type', '').lower()
-        
-        strategy_map = {
-            'ppo': PPOStrategy,
-            'dqn': DQNStrategy,
-            'lstm': LSTMStrategy,
-            'rsi': RSIStrategy,
-            'macd': MACDStrategy,
-        }
-        
-        if strategy_type in strategy_map:
-            return strategy_map[strategy_type](config)
-        else:
+
+        entry = _STRATEGY_MODULES.get(strategy_type)
+        if entry is None:
             logger.warning(f"Tipo de estrategia desconocido: {strategy_type}")
             return None
+
+        module_name, class_name = entry
+        module = importlib.import_module(module_name, __package__)
+        return getattr(module, class_name)(config)
     
     async def get_signals(
         self, 
@@ -123,36 +313,205 @@ class StrategyManager:
             strategies = list(self.strategies.keys())
         
         results = {}
-        
-        # Ejecutar estrategias en paralelo
-        tasks = []
-        for strategy_name in strategies:
-            if strategy_name in self.strategies:
-                task = self._get_strategy_signal(strategy_name, symbol, data)
-                tasks.append((strategy_name, task))
-        
-        # Esperar resultados
-        for strategy_name, task in tasks:
-            try:
-                signal, confidence, metadata = await task
-                results[strategy_name] = StrategyResult(
-                    strategy_name=strategy_name,
-                    signal=signal,
-                    confidence=confidence,
-                    timestamp=datetime.now(),
-                    metadata=metadata
-                )
-                
-                # Actualizar historial
-                if symbol not in self.signal_history:
-                    self.signal_history[symbol] = {}
-                self.signal_history[symbol][strategy_name] = results[strategy_name]
-                
-            except Exception as e:
-                logger.error(f"Error ejecutando estrategia {strategy_name}: {e}")
-        
+
+        # Ejecutar estrategias realmente en paralelo: gather programa
+        # todas las corrutinas a la vez, así la latencia total es la de
+        # la estrategia más lenta y no la suma de todas
+        names = [n for n in strategies if n in self.strategies]
+
+        # Cache de indicadores compartido por el batch: viaja en attrs
+        # para que las estrategias lo reusen sin cambiar prepare_data
+        if 'close' in data.columns:
+            data.attrs['feature_cache'] = FeatureCache(data['close'])
+        data.attrs['market_window'] = self._to_arrays(data)
+
+        # Modo quórum: cortar apenas la mayoría es inalcanzable, sin
+        # esperar a las estrategias lentas
+        if self.ensemble_mode == 'quorum':
+            return await self._get_signals_quorum(symbol, data, names)
+
+        outcomes = await asyncio.gather(
+            *(self._get_strategy_signal(n, symbol, data) for n in names),
+            return_exceptions=True
+        )
+
+        # Un solo datetime.now() por batch: todos los resultados del
+        # mismo tick comparten timestamp en vez de un syscall por
+        # estrategia
+        now = datetime.now()
+
+        for strategy_name, outcome in zip(names, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error ejecutando estrategia {strategy_name}: {outcome}")
+                continue
+
+            signal, confidence, metadata = outcome
+            results[strategy_name] = StrategyResult(
+                strategy_name=strategy_name,
+                signal=signal,
+                confidence=confidence,
+                timestamp=now,
+                metadata=metadata
+            )
+
+            # Actualizar historial
+            with self._state_lock:
+                self.signal_history[symbol].append(results[strategy_name])
+
         return results
     
+    async def get_signals_stream(
+        self,
+        symbol: str,
+        data: pd.DataFrame,
+        strategies: Optional[List[str]] = None
+    ) -> AsyncIterator[Tuple[str, StrategyResult]]:
+        """
+        Versión streaming de get_signals: emite (nombre, resultado)
+        apenas cada estrategia termina
+
+        El caller puede cortar la iteración al recibir una señal
+        suficientemente confiada; al cerrarse el generador las
+        estrategias pendientes se cancelan. El tiempo hasta la primera
+        señal accionable pasa de max(t_i) a min(t_i).
+        """
+        if strategies is None:
+            strategies = list(self.strategies.keys())
+        names = [n for n in strategies if n in self.strategies]
+
+        if 'close' in data.columns:
+            data.attrs['feature_cache'] = FeatureCache(data['close'])
+        data.attrs['market_window'] = self._to_arrays(data)
+
+        tasks = {
+            asyncio.ensure_future(self._get_strategy_signal(n, symbol, data)): n
+            for n in names
+        }
+        pending = set(tasks)
+        now = datetime.now()
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    strategy_name = tasks[task]
+                    try:
+                        signal, confidence, metadata = task.result()
+                    except Exception as e:
+                        logger.error(f"Error ejecutando estrategia {strategy_name}: {e}")
+                        continue
+
+                    result = StrategyResult(
+                        strategy_name=strategy_name,
+                        signal=signal,
+                        confidence=confidence,
+                        timestamp=now,
+                        metadata=metadata
+                    )
+                    with self._state_lock:
+                        self.signal_history[symbol].append(result)
+                    yield strategy_name, result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get_signals_quorum(
+        self,
+        symbol: str,
+        data: pd.DataFrame,
+        names: List[str]
+    ) -> Dict[str, StrategyResult]:
+        """
+        Variante de get_signals que corta por quórum
+
+        Consume las estrategias a medida que terminan y lleva el
+        conteo de votos; cuando el líder supera al segundo más todas
+        las pendientes, el resultado del voting ya no puede cambiar y
+        las estrategias lentas se cancelan.
+        """
+        results = {}
+        tasks = {
+            asyncio.ensure_future(self._get_strategy_signal(n, symbol, data)): n
+            for n in names
+        }
+        pending = set(tasks)
+        votes = [0, 0, 0]
+        now = datetime.now()
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    strategy_name = tasks[task]
+                    try:
+                        signal, confidence, metadata = task.result()
+                    except Exception as e:
+                        logger.error(f"Error ejecutando estrategia {strategy_name}: {e}")
+                        continue
+
+                    result = StrategyResult(
+                        strategy_name=strategy_name,
+                        signal=signal,
+                        confidence=confidence,
+                        timestamp=now,
+                        metadata=metadata
+                    )
+                    results[strategy_name] = result
+                    with self._state_lock:
+                        self.signal_history[symbol].append(result)
+
+                    if confidence >= self.min_confidence:
+                        votes[_SIGNAL_TO_IDX.get(signal.signal_type, 2)] += 1
+                    else:
+                        votes[2] += 1
+
+                leader, second = sorted(votes, reverse=True)[:2]
+                if leader > second + len(pending):
+                    logger.debug(
+                        f"Quórum alcanzado para {symbol}: "
+                        f"cancelando {len(pending)} estrategias pendientes"
+                    )
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return results
+
+    @staticmethod
+    def _to_arrays(df: pd.DataFrame) -> MarketWindow:
+        """
+        Extrae las columnas OHLCV como arrays NumPy sin copia
+
+        Las vistas se marcan read-only: el mismo buffer se comparte
+        entre todas las estrategias despachadas en paralelo, así que
+        ninguna puede pisarlo (y nadie copia la columna por su cuenta)
+        """
+        def _col(name: str) -> np.ndarray:
+            if name not in df.columns:
+                return np.empty(0)
+            view = df[name].to_numpy(copy=False).view()
+            view.flags.writeable = False
+            return view
+
+        ts = df.index.to_numpy(copy=False).view()
+        ts.flags.writeable = False
+
+        return MarketWindow(
+            open=_col('open'),
+            high=_col('high'),
+            low=_col('low'),
+            close=_col('close'),
+            volume=_col('volume'),
+            ts=ts,
+        )
+
     async def _get_strategy_signal(
         self, 
         strategy_name: str, 
@@ -193,42 +552,74 @@ class StrategyManager:
         if not strategy_results:
             return Signal(SignalType.HOLD, 0, 0), 0.0, {}
         
-        # Aplicar método de ensemble
-        if self.ensemble_method == EnsembleMethod.VOTING:
-            return self._voting_ensemble(strategy_results)
-        elif self.ensemble_method == EnsembleMethod.WEIGHTED:
-            return self._weighted_ensemble(strategy_results)
-        elif self.ensemble_method == EnsembleMethod.CONFIDENCE:
-            return self._confidence_ensemble(strategy_results)
-        elif self.ensemble_method == EnsembleMethod.BEST_PERFORMER:
-            return self._best_performer_ensemble(strategy_results)
-        else:
-            return self._voting_ensemble(strategy_results)
+        # Cache: si las estrategias produjeron salidas bit-idénticas a
+        # las de un tick reciente, el resultado del ensemble es el
+        # mismo y se reusa (floats exactos: nada de cuantizar, que
+        # mezclaría ticks distintos)
+        cache_key = (self.ensemble_method,) + tuple(
+            (name, r.signal.signal_type, r.confidence, r.signal.strength)
+            for name, r in strategy_results.items()
+        )
+        with self._state_lock:
+            cached = self._ensemble_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Aplicar método de ensemble; los arrays del batch se arman
+        # una sola vez y los comparten todos los agregadores
+        arrays = self._build_ensemble_arrays(strategy_results)
+        ensemble_fn = self._ensemble_dispatch.get(
+            self.ensemble_method, self._voting_ensemble
+        )
+        result = ensemble_fn(strategy_results, arrays)
+
+        # Evicción FIFO simple aprovechando el orden de inserción
+        with self._state_lock:
+            if len(self._ensemble_cache) >= 256:
+                self._ensemble_cache.pop(next(iter(self._ensemble_cache)))
+            self._ensemble_cache[cache_key] = result
+
+        return result
     
-    def _voting_ensemble(
-        self, 
+    @staticmethod
+    def _build_ensemble_arrays(
         results: Dict[str, StrategyResult]
+    ) -> _EnsembleArrays:
+        """Extrae los arrays paralelos de un batch de resultados"""
+        names = list(results.keys())
+        values = list(results.values())
+        n = len(values)
+        return _EnsembleArrays(
+            names=names,
+            types=np.fromiter(
+                (_SIGNAL_TO_IDX.get(r.signal.signal_type, 2) for r in values),
+                dtype=np.int8, count=n
+            ),
+            codes=np.fromiter(
+                (_SIGNAL_TO_SIGN.get(r.signal.signal_type, 0) for r in values),
+                dtype=np.int8, count=n
+            ),
+            confs=np.fromiter(
+                (r.confidence for r in values), dtype=np.float32, count=n
+            ),
+            strengths=np.fromiter(
+                (r.signal.strength for r in values), dtype=np.float32, count=n
+            ),
+        )
+
+    def _voting_ensemble(
+        self,
+        results: Dict[str, StrategyResult],
+        arrays: Optional[_EnsembleArrays] = None
     ) -> Tuple[Signal, float, Dict[str, Any]]:
         """Ensemble por voto mayoritario"""
-        buy_votes = 0
-        sell_votes = 0
-        hold_votes = 0
-        total_confidence = 0.0
-        
-        for result in results.values():
-            if result.confidence < self.min_confidence:
-                hold_votes += 1
-                continue
-                
-            if result.signal.signal_type == SignalType.BUY:
-                buy_votes += 1
-            elif result.signal.signal_type == SignalType.SELL:
-                sell_votes += 1
-            else:
-                hold_votes += 1
-            
-            total_confidence += result.confidence
-        
+        if arrays is None:
+            arrays = self._build_ensemble_arrays(results)
+
+        buy_votes, sell_votes, hold_votes, total_confidence = _voting_core(
+            arrays.types, arrays.confs, self.min_confidence
+        )
+
         # Determinar señal ganadora
         if buy_votes > sell_votes and buy_votes > hold_votes:
             signal_type = SignalType.BUY
@@ -255,39 +646,27 @@ class StrategyManager:
         return signal, avg_confidence, metadata
     
     def _weighted_ensemble(
-        self, 
-        results: Dict[str, StrategyResult]
+        self,
+        results: Dict[str, StrategyResult],
+        arrays: Optional[_EnsembleArrays] = None
     ) -> Tuple[Signal, float, Dict[str, Any]]:
         """Ensemble por promedio ponderado"""
-        weighted_signal = 0.0
-        total_weight = 0.0
-        total_confidence = 0.0
-        
-        for strategy_name, result in results.items():
-            if result.confidence < self.min_confidence:
-                continue
-            
-            # Obtener peso de la estrategia
-            weight = self.strategy_weights.get(strategy_name, 1.0)
-            
-            # Obtener performance histórico
-            performance = self.performance_metrics.get(strategy_name, {})
-            accuracy_weight = performance.get('accuracy', 0.5)
-            
-            # Peso final combina configuración y performance
-            final_weight = weight * accuracy_weight * result.confidence
-            
-            # Convertir señal a valor numérico
-            signal_value = 0.0
-            if result.signal.signal_type == SignalType.BUY:
-                signal_value = 1.0 * result.signal.strength
-            elif result.signal.signal_type == SignalType.SELL:
-                signal_value = -1.0 * result.signal.strength
-            
-            weighted_signal += signal_value * final_weight
-            total_weight += final_weight
-            total_confidence += result.confidence
-        
+        if arrays is None:
+            arrays = self._build_ensemble_arrays(results)
+
+        # Peso estático (configuración * accuracy) desde el vector
+        # cacheado, indexado por posición de estrategia
+        indices = np.fromiter(
+            (self._strategy_index[nm] for nm in arrays.names),
+            dtype=np.intp, count=len(arrays.names)
+        )
+        static_weights = self._static_weights()[indices]
+
+        weighted_signal, total_weight, total_confidence = _weighted_core(
+            arrays.codes, arrays.strengths, arrays.confs,
+            static_weights, self.min_confidence
+        )
+
         if total_weight == 0:
             signal = Signal(SignalType.HOLD, 0, 0)
             confidence = 0.0
@@ -314,17 +693,35 @@ class StrategyManager:
         
         return signal, confidence, metadata
     
+    def _static_weights(self) -> np.ndarray:
+        """Vector de pesos estáticos por estrategia, reconstruido lazy"""
+        if self._static_weight_vec is None:
+            self._static_weight_vec = np.fromiter(
+                (
+                    self.strategy_weights.get(nm, 1.0)
+                    * self.performance_metrics.get(nm, {}).get('accuracy', 0.5)
+                    for nm in self._strategy_index
+                ),
+                dtype=np.float32, count=len(self._strategy_index)
+            )
+        return self._static_weight_vec
+
     def _confidence_ensemble(
-        self, 
-        results: Dict[str, StrategyResult]
+        self,
+        results: Dict[str, StrategyResult],
+        arrays: Optional[_EnsembleArrays] = None
     ) -> Tuple[Signal, float, Dict[str, Any]]:
         """Ensemble basado en confianza - usa la estrategia más confiada"""
         if not results:
             return Signal(SignalType.HOLD, 0, 0), 0.0, {}
-        
-        # Encontrar resultado con mayor confianza
-        best_result = max(results.values(), key=lambda x: x.confidence)
-        
+
+        # Encontrar resultado con mayor confianza (argmax sobre el
+        # array ya construido cuando está disponible)
+        if arrays is not None:
+            best_result = results[arrays.names[int(np.argmax(arrays.confs))]]
+        else:
+            best_result = max(results.values(), key=lambda x: x.confidence)
+
         metadata = {
             'method': 'confidence',
             'best_strategy': best_result.strategy_name,
@@ -335,36 +732,29 @@ class StrategyManager:
         return best_result.signal, best_result.confidence, metadata
     
     def _best_performer_ensemble(
-        self, 
-        results: Dict[str, StrategyResult]
+        self,
+        results: Dict[str, StrategyResult],
+        arrays: Optional[_EnsembleArrays] = None
     ) -> Tuple[Signal, float, Dict[str, Any]]:
         """Ensemble basado en mejor performer histórico"""
         if not results:
             return Signal(SignalType.HOLD, 0, 0), 0.0, {}
-        
-        # Encontrar estrategia con mejor accuracy histórico
-        best_strategy = None
-        best_accuracy = 0.0
-        
-        for strategy_name in results.keys():
-            metrics = self.performance_metrics.get(strategy_name, {})
-            accuracy = metrics.get('accuracy', 0.0)
-            
-            if accuracy > best_accuracy:
-                best_accuracy = accuracy
-                best_strategy = strategy_name
-        
-        if best_strategy and best_strategy in results:
-            best_result = results[best_strategy]
+
+        # El mejor performer se mantiene incrementalmente en
+        # update_performance: acá solo es un lookup O(1)
+        best_strategy = self._best_performer_name
+        best_result = results.get(best_strategy) if best_strategy else None
+
+        if best_result is not None:
             metadata = {
                 'method': 'best_performer',
                 'best_strategy': best_strategy,
-                'best_accuracy': best_accuracy
+                'best_accuracy': self._best_accuracy
             }
             return best_result.signal, best_result.confidence, metadata
-        
-        # Fallback a voting si no hay histórico
-        return self._voting_ensemble(results)
+
+        # Fallback a voting si no hay histórico o el mejor no participó
+        return self._voting_ensemble(results, arrays)
     
     async def update_performance(
         self, 
@@ -384,9 +774,34 @@ class StrategyManager:
         
         metrics['accuracy'] = metrics['correct_signals'] / metrics['total_signals']
         metrics['total_return'] += return_pct
-        
-        logger.debug(f"Performance actualizada para {strategy_name}: "
-                    f"accuracy={metrics['accuracy']:.2%}")
+
+        # Invalidar el vector de pesos estáticos y el cache de
+        # ensembles: los pesos/accuracy cambian el resultado para las
+        # mismas señales de entrada
+        with self._state_lock:
+            self._static_weight_vec = None
+            self._ensemble_cache.clear()
+
+        # Mantener el mejor performer al día: O(1) salvo que el líder
+        # actual empeore, en cuyo caso se re-escanea una vez
+        accuracy = metrics['accuracy']
+        if accuracy > self._best_accuracy:
+            self._best_performer_name = strategy_name
+            self._best_accuracy = accuracy
+        elif strategy_name == self._best_performer_name:
+            self._best_performer_name, self._best_accuracy = max(
+                (
+                    (name, m.get('accuracy', 0.0))
+                    for name, m in self.performance_metrics.items()
+                ),
+                key=lambda item: item[1],
+                default=(None, 0.0)
+            )
+
+        # Formateo diferido: con DEBUG deshabilitado no se paga el
+        # armado del string en este camino por fill
+        logger.debug("Performance actualizada para %s: accuracy=%.2f%%",
+                     strategy_name, metrics['accuracy'] * 100)
     
     def get_strategy_status(self) -> Dict[str, Any]:
         """Obtiene estado de todas las estrategias"""
@@ -410,15 +825,38 @@ class StrategyManager:
             Resultados de backtesting por estrategia
         """
         backtest_results = {}
-        
-        for strategy_name, strategy in self.strategies.items():
-            try:
-                logger.info(f"Ejecutando backtest para {strategy_name}")
-                results = await strategy.backtest(symbol, historical_data)
-                backtest_results[strategy_name] = results
-                
-            except Exception as e:
-                logger.error(f"Error en backtest de {strategy_name}: {e}")
-                backtest_results[strategy_name] = {'error': str(e)}
-        
+
+        names = list(self.strategies.keys())
+        logger.info(f"Ejecutando backtest para {len(names)} estrategias")
+
+        # Los backtests son CPU-bound: si todas las estrategias exponen
+        # un punto de entrada síncrono picklable (backtest_sync), se
+        # reparten entre procesos para escalar a todos los cores.
+        # Si no, fallback al gather concurrente en el event loop.
+        sync_fns = [
+            getattr(self.strategies[n], 'backtest_sync', None) for n in names
+        ]
+        if names and all(fn is not None for fn in sync_fns):
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor() as pool:
+                outcomes = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(pool, fn, symbol, historical_data)
+                        for fn in sync_fns
+                    ),
+                    return_exceptions=True
+                )
+        else:
+            outcomes = await asyncio.gather(
+                *(self.strategies[n].backtest(symbol, historical_data) for n in names),
+                return_exceptions=True
+            )
+
+        for strategy_name, outcome in zip(names, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error en backtest de {strategy_name}: {outcome}")
+                backtest_results[strategy_name] = {'error': str(outcome)}
+            else:
+                backtest_results[strategy_name] = outcome
+
         return backtest_results
\ No newline at end of file